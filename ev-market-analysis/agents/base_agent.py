@@ -2,12 +2,39 @@
 # agents/base_agent.py
 
 from abc import ABC, abstractmethod
+from dataclasses import asdict, is_dataclass
 from typing import Dict, Any, Optional
 from datetime import datetime
+import asyncio
 import json
 import logging
 from pathlib import Path
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+_ORJSON_OPTIONS = (
+    orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+    if ORJSON_AVAILABLE else 0
+)
+
+
+def _json_default(obj):
+    """orjson/json이 직접 처리하지 못하는 객체 변환 (dataclass, numpy 스칼라, pandas Timestamp/Series 등)"""
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return asdict(obj)
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    if hasattr(obj, 'item'):
+        return obj.item()
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    raise TypeError(f"직렬화할 수 없는 타입: {type(obj).__name__}")
+
+
 class BaseAgent(ABC):
     """모든 Agent의 기본 클래스"""
     
@@ -67,18 +94,42 @@ class BaseAgent(ABC):
         pass
     
     def save_output(self, data: Any, filename: str):
-        """결과 저장"""
+        """결과 저장 (orjson이 있으면 JSON을 orjson으로 직렬화)"""
         output_path = self.output_dir / filename
         
-        if filename.endswith('.json'):
+        if filename.endswith('.json') and ORJSON_AVAILABLE:
+            with open(output_path, 'wb') as f:
+                f.write(orjson.dumps(data, default=_json_default, option=_ORJSON_OPTIONS))
+        elif filename.endswith('.json'):
             with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+                json.dump(data, f, ensure_ascii=False, indent=2, default=_json_default)
         else:
             with open(output_path, 'w', encoding='utf-8') as f:
                 f.write(str(data))
         
         self.logger.info(f"결과 저장 완료: {output_path}")
     
+    async def asave_output(self, data: Any, filename: str):
+        """결과 저장 (직렬화와 파일 쓰기를 스레드에서 실행해 이벤트 루프를 막지 않음)"""
+        await asyncio.to_thread(self.save_output, data, filename)
+    
+    async def append_log(self, record: Any, filename: Optional[str] = None):
+        """JSONL 로그 파일에 레코드 한 줄 추가 (파일 전체를 다시 쓰지 않음)"""
+        log_path = self.output_dir / (filename or f'{self.name}.jsonl')
+        
+        if ORJSON_AVAILABLE:
+            line = orjson.dumps(record, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY) + b'\n'
+        else:
+            line = (json.dumps(record, ensure_ascii=False, default=_json_default) + '\n').encode('utf-8')
+        
+        await asyncio.to_thread(self._append_bytes, log_path, line)
+    
+    @staticmethod
+    def _append_bytes(path: Path, data: bytes):
+        # 한 줄을 한 번의 write로 추가해 줄이 섞이거나 잘리지 않도록 함
+        with open(path, 'ab') as f:
+            f.write(data)
+    
     def load_data(self, filepath: str) -> Any:
         """데이터 로드"""
         path = Path(filepath)
@@ -30,6 +30,13 @@ class ChartGenerationAgent(BaseAgent):
     def __init__(self, llm=None, config: Optional[Dict] = None):
         super().__init__("chart_generation", llm, config)
         self.use_image_generation = CHART_IMAGE_AVAILABLE
+        # 테스트용 인위적 지연 (기본값 0: 차트 생성은 로컬 작업이라 대기할 필요 없음)
+        self.simulate_latency = self.config.get('simulate_latency', 0)
+    
+    async def _simulate_latency(self):
+        """simulate_latency 설정 시에만 지연 (초)"""
+        if self.simulate_latency:
+            await asyncio.sleep(self.simulate_latency)
         
     async def process(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """차트 생성 메인 프로세스"""
@@ -172,7 +179,7 @@ class ChartGenerationAgent(BaseAgent):
         """시장 성장 차트 생성"""
         self.logger.info("시장 성장 차트 생성 중...")
         
-        await asyncio.sleep(0.5)
+        await self._simulate_latency()
         
         # 실제로는 plotly나 matplotlib 사용
         return {
@@ -201,7 +208,7 @@ class ChartGenerationAgent(BaseAgent):
         """시장 점유율 차트 생성"""
         self.logger.info("시장 점유율 차트 생성 중...")
         
-        await asyncio.sleep(0.5)
+        await self._simulate_latency()
         
         companies = company_analysis.get('companies', {})
         
@@ -238,7 +245,7 @@ class ChartGenerationAgent(BaseAgent):
         """기술 로드맵 차트 생성"""
         self.logger.info("기술 로드맵 차트 생성 중...")
         
-        await asyncio.sleep(0.5)
+        await self._simulate_latency()
         
         roadmap = tech_trends.get('roadmap', {}).get('critical_milestones', {})
         
@@ -265,7 +272,7 @@ class ChartGenerationAgent(BaseAgent):
         self.logger.info("주가 성과 차트 생성 중...")
         
         try:
-            await asyncio.sleep(0.5)
+            await self._simulate_latency()
             
             # ⭐ 안전한 데이터 체크
             if not stock_analysis or not isinstance(stock_analysis, dict):
@@ -349,7 +356,7 @@ class ChartGenerationAgent(BaseAgent):
         self.logger.info("소비자 선호도 차트 생성 중...")
         
         try:
-            await asyncio.sleep(0.5)
+            await self._simulate_latency()
             
             # ⭐ 안전한 데이터 접근
             if not consumer_patterns or not isinstance(consumer_patterns, dict):
@@ -398,7 +405,7 @@ class ChartGenerationAgent(BaseAgent):
         self.logger.info("지역별 비교 차트 생성 중...")
         
         try:
-            await asyncio.sleep(0.5)
+            await self._simulate_latency()
             
             # 안전한 데이터 접근
             if not market_data or not isinstance(market_data, dict):
@@ -494,7 +501,7 @@ class ChartGenerationAgent(BaseAgent):
         """밸류에이션 비교 차트 생성"""
         self.logger.info("밸류에이션 비교 차트 생성 중...")
         
-        await asyncio.sleep(0.5)
+        await self._simulate_latency()
         
         stocks = stock_analysis.get('individual_stocks', {})
         
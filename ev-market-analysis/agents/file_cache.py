@@ -0,0 +1,81 @@
+# 메모리 + 디스크 TTL 캐시
+# agents/file_cache.py
+"""
+Agent 간에 재사용할 수 있는 간단한 파일 캐시
+
+- 키(문자열/튜플)는 MD5 해시로 파일명을 만들어 디렉터리에 pickle로 저장
+- 항목마다 TTL(초)을 지정할 수 있고, 만료된 항목은 조회 시 None
+- 같은 프로세스 안에서는 메모리 dict가 먼저 응답하고, asyncio.Lock으로 동시 접근을 보호
+"""
+
+import asyncio
+import hashlib
+import os
+import pickle
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+
+class FileCache:
+    """(키 → 값) TTL 캐시 (메모리 우선, 디스크 보조)"""
+
+    def __init__(self, directory, ttl: float = 3600):
+        """
+        Args:
+            directory: 캐시 파일을 저장할 디렉터리
+            ttl: 기본 만료 시간 (초)
+        """
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self._memory: Dict[str, Tuple[float, float, Any]] = {}
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def key(*parts) -> str:
+        """키 구성 요소를 하나의 문자열 키로 변환"""
+        return ":".join(str(part) for part in parts)
+
+    def _path(self, key: str) -> Path:
+        digest = hashlib.md5(key.encode('utf-8')).hexdigest()
+        return self.directory / f"{digest}.pkl"
+
+    async def get(self, key: str) -> Optional[Any]:
+        """캐시 조회 (없거나 만료되면 None)"""
+        async with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                entry = await asyncio.to_thread(self._read, self._path(key))
+                if entry is None:
+                    return None
+                self._memory[key] = entry
+
+            stored_at, ttl, value = entry
+            if time.time() - stored_at > ttl:
+                self._memory.pop(key, None)
+                return None
+            return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """캐시 저장 (ttl 미지정 시 기본 TTL, 디스크 저장 실패 시 예외 전파)"""
+        entry = (time.time(), self.ttl if ttl is None else ttl, value)
+        async with self._lock:
+            self._memory[key] = entry
+            await asyncio.to_thread(self._write, self._path(key), entry)
+
+    @staticmethod
+    def _read(path: Path) -> Optional[Tuple[float, float, Any]]:
+        try:
+            if not path.exists():
+                return None
+            return pickle.loads(path.read_bytes())
+        except Exception:
+            # 손상된 캐시 파일은 없는 것으로 취급
+            return None
+
+    def _write(self, path: Path, entry: Tuple[float, float, Any]):
+        # 임시 파일에 쓴 뒤 교체해 읽는 쪽이 쓰다 만 파일을 보지 않도록 함
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        tmp_path.write_bytes(pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL))
+        os.replace(tmp_path, path)
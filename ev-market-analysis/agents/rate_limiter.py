@@ -0,0 +1,134 @@
+# 외부 API 호출 속도 제한
+# agents/rate_limiter.py
+"""
+Tavily 등 외부 검색 API 호출을 여러 코루틴이 공유할 때 쓰는 제한기
+
+- 동시 요청 수: AdaptiveSemaphore (AIMD - 성공 시 조금씩 늘리고, 429/5xx 응답 시 절반으로 줄임)
+- 기간당 요청 수: 슬라이딩 윈도우 (최근 period 초 동안의 호출 시각을 deque로 기록)
+  고정 간격 대기와 달리 한도에 닿았을 때만, 가장 오래된 호출이 윈도우를 벗어날 때까지 기다림
+- Retry-After: 제한 응답을 받으면 지정 시간 동안 모든 호출을 멈춤
+- 사용법: `async with limiter:` 안에서 API 호출, 결과에 따라 record_success / record_throttle
+"""
+
+import asyncio
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Deque, Optional
+
+
+def parse_retry_after(value: Optional[str], default: float = 1.0) -> float:
+    """Retry-After 헤더 값(초 또는 HTTP 날짜)을 대기 초로 변환"""
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
+
+
+class AdaptiveSemaphore:
+    """실행 중에 한도를 바꿀 수 있는 세마포어 (한도는 실수, 실제 슬롯 수는 정수 부분)"""
+
+    def __init__(self, limit: float, min_limit: float = 1, max_limit: Optional[float] = None):
+        self.min_limit = min_limit
+        self.max_limit = max_limit if max_limit is not None else limit
+        self.limit = float(limit)
+        self._active = 0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._active < max(1, int(self.limit)))
+            self._active += 1
+
+    async def release(self):
+        async with self._condition:
+            self._active -= 1
+            self._condition.notify_all()
+
+    async def resize(self, limit: float):
+        """한도 변경 (min_limit ~ max_limit 범위로 제한, 늘어나면 대기자 깨움)"""
+        async with self._condition:
+            self.limit = min(self.max_limit, max(self.min_limit, limit))
+            self._condition.notify_all()
+
+
+class TavilyLimiter:
+    """동시 요청 수(적응형) + 기간당 요청 수 제한기"""
+
+    def __init__(self, max_concurrent: int = 4, max_calls: int = 100, period: float = 60.0,
+                 min_concurrent: int = 1, increase: float = 0.5, decrease: float = 0.5):
+        """
+        Args:
+            max_concurrent: 동시에 진행할 수 있는 최대 요청 수 (시작 값)
+            max_calls: period 초 동안 허용하는 요청 수 (기본: 분당 100회)
+            period: 슬라이딩 윈도우 길이 (초)
+            min_concurrent: 제한 응답이 이어져도 유지할 최소 동시 요청 수
+            increase: 성공 응답마다 늘릴 동시 요청 수
+            decrease: 제한 응답 시 곱할 비율
+        """
+        self.max_concurrent = max_concurrent
+        self.max_calls = max_calls
+        self.period = period
+        self.increase = increase
+        self.decrease = decrease
+        self._semaphore = AdaptiveSemaphore(max_concurrent, min_limit=min_concurrent)
+        self._call_times: Deque[float] = deque()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def concurrency(self) -> float:
+        """현재 동시 요청 한도"""
+        return self._semaphore.limit
+
+    async def pace(self):
+        """윈도우에 자리가 날 때까지 대기한 뒤 호출 시각 기록
+
+        대기 시간은 lock 안에서 계산만 하고 sleep은 lock 밖에서 해,
+        잠든 코루틴 하나가 다른 대기자들의 확인을 막지 않도록 함
+        """
+        while True:
+            async with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                else:
+                    while self._call_times and self._call_times[0] <= now - self.period:
+                        self._call_times.popleft()
+                    if len(self._call_times) < self.max_calls:
+                        self._call_times.append(now)
+                        return
+                    wait = self._call_times[0] + self.period - now
+            await asyncio.sleep(wait)
+
+    async def record_success(self):
+        """정상 응답 - 동시 요청 한도를 조금 늘림 (가산 증가)"""
+        await self._semaphore.resize(self._semaphore.limit + self.increase)
+
+    async def record_throttle(self, retry_after: float = 0.0):
+        """제한(429/5xx) 응답 - 동시 요청 한도를 줄이고 retry_after 초 동안 새 호출을 멈춤 (승산 감소)"""
+        await self._semaphore.resize(self._semaphore.limit * self.decrease)
+        if retry_after > 0:
+            async with self._lock:
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+
+    async def __aenter__(self):
+        # 동시 실행 슬롯을 먼저 잡은 뒤 윈도우 자리를 받음
+        # (자리를 먼저 받으면 슬롯을 기다리는 동안에도 윈도우에 기록돼, 실제 시작 시각 기준으로는 한도를 넘김)
+        await self._semaphore.acquire()
+        try:
+            await self.pace()
+        except BaseException:
+            # 대기 중 취소되면 슬롯을 돌려줌
+            await self._semaphore.release()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._semaphore.release()
@@ -1,16 +1,274 @@
 # 리포트 생성 Agent - 최종 보고서 작성
 # agents/report_generation_agent.py
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterator, TextIO
 import asyncio
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+import json
+import re
+from itertools import islice
+from string import Template
 from datetime import datetime
 from pathlib import Path
 from .base_agent import BaseAgent
+from .report_html import format_text_to_html, convert_table_to_html
 import pdfkit
 import os
 
+# 섹션 생성 프롬프트 공통 응답 형식 (JSON 모드)
+_SECTION_JSON_INSTRUCTION = """
+
+응답은 반드시 다음 키를 가진 JSON 객체로만 작성하세요:
+{"content": "본문 (Markdown 형식)"}"""
+
+# HTML 리포트 본문 섹션 (템플릿 순서와 무관하게 치환 값 생성에 사용)
+_HTML_SECTION_KEYS = (
+    'summary', 'market_analysis', 'consumer_analysis', 'company_analysis',
+    'technology_analysis', 'stock_analysis', 'future_outlook'
+)
+
+# HTML 리포트 공통 스타일 - 출력 디렉토리에 report.css로 한 번만 기록
+_REPORT_CSS = """body {
+    font-family: 'Noto Sans KR', 'Malgun Gothic', sans-serif;
+    line-height: 1.8;
+    max-width: 1200px;
+    margin: 0 auto;
+    padding: 40px 20px;
+    background-color: #f8f9fa;
+    color: #333;
+}
+h1 {
+    color: #1a1a1a;
+    border-bottom: 4px solid #2c3e50;
+    padding-bottom: 15px;
+    margin-bottom: 30px;
+    font-size: 2.5em;
+}
+h2 {
+    color: #2c3e50;
+    margin-top: 40px;
+    border-left: 6px solid #3498db;
+    padding-left: 20px;
+    font-size: 1.8em;
+}
+h3 {
+    color: #34495e;
+    margin-top: 25px;
+    font-size: 1.3em;
+}
+.metadata {
+    background-color: #ecf0f1;
+    padding: 20px;
+    border-radius: 8px;
+    margin-bottom: 30px;
+}
+.metadata p {
+    margin: 5px 0;
+    color: #555;
+}
+.description {
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    color: white;
+    padding: 25px;
+    border-radius: 8px;
+    margin: 30px 0;
+    font-size: 1.1em;
+}
+.section {
+    background-color: white;
+    padding: 30px;
+    margin-bottom: 30px;
+    border-radius: 8px;
+    box-shadow: 0 2px 8px rgba(0,0,0,0.1);
+}
+.section-content {
+    line-height: 1.9;
+    font-size: 1.05em;
+}
+.references {
+    background-color: #f8f9fa;
+    padding: 20px;
+    border-radius: 8px;
+    margin-top: 40px;
+}
+.reference-item {
+    background-color: white;
+    padding: 15px;
+    margin: 15px 0;
+    border-left: 4px solid #3498db;
+    border-radius: 4px;
+}
+.reference-item h4 {
+    margin: 0 0 10px 0;
+    color: #2c3e50;
+}
+.reference-item p {
+    margin: 5px 0;
+    color: #666;
+}
+table {
+    width: 100%;
+    border-collapse: collapse;
+    margin: 20px 0;
+}
+th, td {
+    padding: 12px;
+    text-align: left;
+    border: 1px solid #ddd;
+}
+th {
+    background-color: #3498db;
+    color: white;
+    font-weight: bold;
+}
+tr:nth-child(even) {
+    background-color: #f2f2f2;
+}
+.methodology {
+    background-color: #e8f8f5;
+    padding: 20px;
+    border-radius: 8px;
+    border-left: 5px solid #27ae60;
+    margin-top: 40px;
+}
+"""
+_REPORT_CSS_FILENAME = 'report.css'
+_REPORT_CSS_HASH = hashlib.sha256(_REPORT_CSS.encode('utf-8')).hexdigest()
+
+# HTML 리포트 파일 기록 버퍼 크기 (기본 8 KiB 대신 128 KiB)
+_REPORT_WRITE_BUFFER = 1 << 17
+
+# HTML 리포트 골격
+_REPORT_HTML_SKELETON = """<!DOCTYPE html>
+<html lang="ko">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>$title</title>
+    <link rel="stylesheet" href="$css_href">
+</head>
+<body>
+    <h1>$title</h1>
+    
+    <div class="metadata">
+        <p><strong>생성일:</strong> $generated_date</p>
+        <p><strong>버전:</strong> $version</p>
+        <p><strong>리포트 ID:</strong> $report_id</p>
+        <p><strong>분석 기간:</strong> $analysis_period</p>
+    </div>
+    
+    <div class="description">
+        <h3>보고서 설명</h3>
+        <p>$description</p>
+    </div>
+    
+    <div class="section">
+        <h2>$summary_title</h2>
+        <div class="section-content">
+            $summary_html
+        </div>
+    </div>
+    
+    <div class="section">
+        <h2>$market_analysis_title</h2>
+        <div class="section-content">
+            $market_analysis_html
+        </div>
+    </div>
+    
+    <div class="section">
+        <h2>$consumer_analysis_title</h2>
+        <div class="section-content">
+            $consumer_analysis_html
+        </div>
+    </div>
+    
+    <div class="section">
+        <h2>$company_analysis_title</h2>
+        <div class="section-content">
+            $company_analysis_html
+        </div>
+    </div>
+    
+    <div class="section">
+        <h2>$technology_analysis_title</h2>
+        <div class="section-content">
+            $technology_analysis_html
+        </div>
+    </div>
+    
+    <div class="section">
+        <h2>$stock_analysis_title</h2>
+        <div class="section-content">
+            $stock_analysis_html
+        </div>
+    </div>
+    
+        $chart_html
+    
+    <div class="section">
+        <h2>$future_outlook_title</h2>
+        <div class="section-content">
+            $future_outlook_html
+        </div>
+    </div>
+    
+    <div class="references">
+        <h2>$references_title</h2>
+        <h3>참고한 문헌 및 사이트</h3>
+$references_html
+    </div>
+    
+    <div class="methodology">
+        <h2>분석 방법론</h2>
+        <p>$methodology</p>
+    </div>
+</body>
+</html>"""
+
+# 골격을 차트/참고 자료 위치에서 분할하여 조각 단위로 출력 - import 시 한 번만 파싱
+_REPORT_HTML_HEAD, _REPORT_HTML_MIDDLE, _REPORT_HTML_TAIL = (
+    Template(part) for part in re.split(r'\$chart_html|\$references_html', _REPORT_HTML_SKELETON)
+)
+
+
+def _content_head(result: Dict, limit: int) -> str:
+    """검색 결과의 content 앞부분 추출 (bytes는 필요한 구간만 디코딩)"""
+    content = result.get('content') or ''
+    if isinstance(content, bytes):
+        # UTF-8은 문자당 최대 4바이트 → limit * 4 바이트만 디코딩
+        return content[:limit * 4].decode('utf-8', errors='ignore')[:limit]
+    return content[:limit]
+
+
+def _format_reference_html(index: int, source: Dict) -> str:
+    """참고 자료 항목 하나를 HTML 블록으로 변환"""
+    url_html = (
+        f"            <p><strong>URL:</strong> <a href=\"{source['url']}\" target=\"_blank\">{source['url']}</a></p>\n"
+        if 'url' in source else ''
+    )
+    note_html = (
+        f"            <p><strong>비고:</strong> {source['note']}</p>\n"
+        if 'note' in source else ''
+    )
+    return f"""
+        <div class="reference-item">
+            <h4>{index}. {source['name']}</h4>
+            <p><strong>유형:</strong> {source['type']}</p>
+            <p><strong>설명:</strong> {source['description']}</p>
+{url_html}{note_html}        </div>
+"""
+
+
 class ReportGenerationAgent(BaseAgent):
-    """리포트 생성 Agent - 실제 검색 결과 기반"""
+    """리포트 생성 Agent - 실제 검색 결과 기반
+    
+    HTML 리포트는 write_report()로 128 KiB 버퍼를 사용해 기록합니다.
+    """
+    
+    # 섹션 키 구성별로 생성된 HTML 섹션 렌더러 캐시
+    _section_renderers: Dict[tuple, Any] = {}
     
     def __init__(self, llm=None, config: Optional[Dict] = None):
         super().__init__("report_generation", llm, config)
@@ -75,7 +333,10 @@ class ReportGenerationAgent(BaseAgent):
             
             # HTML 버전
             html_report = self._format_as_html(final_report)
-            self.save_output(html_report, f'report_{timestamp}.html')
+            self._write_report_css()
+            html_path = self.output_dir / f'report_{timestamp}.html'
+            self.write_report(html_path, html_report)
+            self.logger.info(f"결과 저장 완료: {html_path}")
             
             # JSON 버전 (구조화된 데이터)
             self.save_output(final_report, f'report_data_{timestamp}.json')
@@ -176,17 +437,16 @@ class ReportGenerationAgent(BaseAgent):
 한국어로 작성하세요."""
             
             try:
-                response = await self.llm.ainvoke(prompt)
-                summary_text = response.content if hasattr(response, 'content') else str(response)
+                section = await self._invoke_section_llm(prompt)
             except Exception as e:
                 self.logger.error(f"요약 생성 오류: {e}")
-                summary_text = self._generate_default_summary()
+                section = {'content': self._generate_default_summary()}
         else:
-            summary_text = self._generate_default_summary()
+            section = {'content': self._generate_default_summary()}
         
         return {
             'title': '요약',
-            'content': summary_text
+            **section
         }
     
     async def _generate_market_analysis(self, analysis_data: Dict) -> Dict:
@@ -233,12 +493,11 @@ class ReportGenerationAgent(BaseAgent):
 
 한국어로 작성하고, 가능한 구체적인 수치와 사실을 포함하세요."""
             
-            response = await self.llm.ainvoke(prompt)
-            content = response.content if hasattr(response, 'content') else str(response)
+            section = await self._invoke_section_llm(prompt)
             
             return {
                 'title': '시장 분석',
-                'content': content,
+                **section,
                 'data_sources': ['Tavily Web Search', 'Market Research Agent']
             }
             
@@ -284,12 +543,11 @@ class ReportGenerationAgent(BaseAgent):
 
 한국어로 작성하고, 구체적인 통계나 트렌드를 포함하세요."""
             
-            response = await self.llm.ainvoke(prompt)
-            content = response.content if hasattr(response, 'content') else str(response)
+            section = await self._invoke_section_llm(prompt)
             
             return {
                 'title': '소비자 분석',
-                'content': content,
+                **section,
                 'key_factors': [k for k, v in top_factors],
                 'data_sources': ['Tavily Web Search', 'Consumer Analysis Agent']
             }
@@ -338,12 +596,11 @@ class ReportGenerationAgent(BaseAgent):
 
 한국어로 작성하고, 기업명과 구체적인 수치를 포함하세요."""
             
-            response = await self.llm.ainvoke(prompt)
-            content = response.content if hasattr(response, 'content') else str(response)
+            section = await self._invoke_section_llm(prompt)
             
             return {
                 'title': '기업 분석',
-                'content': content,
+                **section,
                 'analyzed_companies': list(companies.keys()),
                 'data_sources': ['Tavily Web Search', 'Company Analysis Agent', 'Company Reports']
             }
@@ -405,12 +662,11 @@ class ReportGenerationAgent(BaseAgent):
 
 한국어로 작성하고, 구체적인 기술명과 예상 상용화 시기를 포함하세요."""
             
-            response = await self.llm.ainvoke(prompt)
-            content = response.content if hasattr(response, 'content') else str(response)
+            section = await self._invoke_section_llm(prompt)
             
             return {
                 'title': '기술 분석',
-                'content': content,
+                **section,
                 'data_sources': ['Tavily Web Search', 'Technology Analysis Agent', 'Company Reports']
             }
             
@@ -433,21 +689,14 @@ class ReportGenerationAgent(BaseAgent):
             valuation_metrics = stock_data.get('valuation_metrics', {})
             individual_stocks = stock_data.get('individual_stocks', {})
             
-            # 주요 주식 성과 추출
-            stock_performances = []
-            for ticker, data in individual_stocks.items():
-                company = data.get('company', ticker)
-                price_history = data.get('price_history', {})
-                financials = data.get('financials', {})
-                
-                stock_performances.append(
-                    f"**{ticker} ({company})**\n"
-                    f"- 1년 수익률: {price_history.get('1y_change', 0)*100:.1f}%\n"
-                    f"- 시가총액: ${financials.get('market_cap', 0)/1e9:.1f}B\n"
-                    f"- 매출 성장률: {financials.get('revenue_growth', 0)*100:.1f}%"
-                )
-            
-            stocks_text = "\n\n".join(stock_performances[:8])
+            # 주요 주식 성과 추출 (상위 8개 종목만 포맷)
+            stocks_text = "\n\n".join(
+                f"**{ticker} ({data.get('company', ticker)})**\n"
+                f"- 1년 수익률: {data.get('price_history', {}).get('1y_change', 0)*100:.1f}%\n"
+                f"- 시가총액: ${data.get('financials', {}).get('market_cap', 0)/1e9:.1f}B\n"
+                f"- 매출 성장률: {data.get('financials', {}).get('revenue_growth', 0)*100:.1f}%"
+                for ticker, data in islice(individual_stocks.items(), 8)
+            )
             
             prompt = f"""최근 1년간 전기차 관련 주식의 성과를 분석하고, 기업들의 재무 상황을 평가하세요.
 
@@ -480,12 +729,11 @@ class ReportGenerationAgent(BaseAgent):
 
 한국어로 작성하고, 구체적인 티커 심볼과 수치를 포함하세요."""
             
-            response = await self.llm.ainvoke(prompt)
-            content = response.content if hasattr(response, 'content') else str(response)
+            section = await self._invoke_section_llm(prompt)
             
             return {
                 'title': '최근 주가 분석',
-                'content': content,
+                **section,
                 'analyzed_stocks': list(individual_stocks.keys()),
                 'data_sources': ['Stock Analysis Agent', 'Financial Data']
             }
@@ -556,12 +804,11 @@ class ReportGenerationAgent(BaseAgent):
 
 한국어로 작성하고, 구체적이고 실행 가능한 인사이트를 제공하세요."""
             
-            response = await self.llm.ainvoke(prompt)
-            content = response.content if hasattr(response, 'content') else str(response)
+            section = await self._invoke_section_llm(prompt)
             
             return {
                 'title': '향후 전기차 시장',
-                'content': content
+                **section
             }
             
         except Exception as e:
@@ -622,6 +869,25 @@ class ReportGenerationAgent(BaseAgent):
         
         return references
     
+    async def _invoke_section_llm(self, prompt: str) -> Dict:
+        """JSON 모드로 LLM을 호출하여 섹션 필드(content) 반환"""
+        response = await self.llm.ainvoke(
+            prompt + _SECTION_JSON_INSTRUCTION,
+            response_format={"type": "json_object"}
+        )
+        
+        try:
+            parsed = json.loads(response.content)
+        except (TypeError, ValueError):
+            parsed = None
+        
+        if not isinstance(parsed, dict):
+            # JSON 파싱 실패 시 응답 원문을 본문으로 사용
+            self.logger.warning("섹션 응답이 JSON 형식이 아닙니다. 원문을 사용합니다.")
+            return {'content': str(response.content)}
+        
+        return {'content': parsed.get('content', '')}
+    
     # Helper methods for data extraction
     
     def _extract_search_insights(self, search_data: Dict) -> str:
@@ -638,7 +904,7 @@ class ReportGenerationAgent(BaseAgent):
         if results:
             insights = []
             for r in results[:3]:
-                content = r.get('content', '')[:150]
+                content = _content_head(r, 150)
                 if content:
                     insights.append(content)
             return " | ".join(insights)
@@ -656,7 +922,7 @@ class ReportGenerationAgent(BaseAgent):
         for region, data in regions.items():
             results = data.get('results', [])
             if results:
-                content = results[0].get('content', '')[:100]
+                content = _content_head(results[0], 100)
                 insights.append(f"{region}: {content}")
         
         return " | ".join(insights[:3]) if insights else "지역별 데이터 없음"
@@ -672,7 +938,7 @@ class ReportGenerationAgent(BaseAgent):
             for p in policies[:3]:
                 results = p.get('results', [])
                 if results:
-                    content = results[0].get('content', '')[:100]
+                    content = _content_head(results[0], 100)
                     insights.append(content)
             return " | ".join(insights) if insights else "정책 데이터 없음"
         
@@ -691,7 +957,7 @@ class ReportGenerationAgent(BaseAgent):
                 for s in searches[:2]:
                     results = s.get('results', [])
                     if results:
-                        content = results[0].get('content', '')[:100]
+                        content = _content_head(results[0], 100)
                         insights.append(content)
                 if insights:
                     return " | ".join(insights)
@@ -1019,184 +1285,32 @@ Tavily API를 통해 최신 웹 정보를 수집하고, OpenAI GPT-4를 활용
         
         return md
     
-    def _format_as_html(self, report: Dict) -> str:
-        """HTML 형식으로 변환"""
-        html = f"""<!DOCTYPE html>
-<html lang="ko">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{report['metadata']['title']}</title>
-    <style>
-        body {{
-            font-family: 'Noto Sans KR', 'Malgun Gothic', sans-serif;
-            line-height: 1.8;
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 40px 20px;
-            background-color: #f8f9fa;
-            color: #333;
-        }}
-        h1 {{
-            color: #1a1a1a;
-            border-bottom: 4px solid #2c3e50;
-            padding-bottom: 15px;
-            margin-bottom: 30px;
-            font-size: 2.5em;
-        }}
-        h2 {{
-            color: #2c3e50;
-            margin-top: 40px;
-            border-left: 6px solid #3498db;
-            padding-left: 20px;
-            font-size: 1.8em;
-        }}
-        h3 {{
-            color: #34495e;
-            margin-top: 25px;
-            font-size: 1.3em;
-        }}
-        .metadata {{
-            background-color: #ecf0f1;
-            padding: 20px;
-            border-radius: 8px;
-            margin-bottom: 30px;
-        }}
-        .metadata p {{
-            margin: 5px 0;
-            color: #555;
-        }}
-        .description {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 25px;
-            border-radius: 8px;
-            margin: 30px 0;
-            font-size: 1.1em;
-        }}
-        .section {{
-            background-color: white;
-            padding: 30px;
-            margin-bottom: 30px;
-            border-radius: 8px;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-        }}
-        .section-content {{
-            line-height: 1.9;
-            font-size: 1.05em;
-        }}
-        .references {{
-            background-color: #f8f9fa;
-            padding: 20px;
-            border-radius: 8px;
-            margin-top: 40px;
-        }}
-        .reference-item {{
-            background-color: white;
-            padding: 15px;
-            margin: 15px 0;
-            border-left: 4px solid #3498db;
-            border-radius: 4px;
-        }}
-        .reference-item h4 {{
-            margin: 0 0 10px 0;
-            color: #2c3e50;
-        }}
-        .reference-item p {{
-            margin: 5px 0;
-            color: #666;
-        }}
-        table {{
-            width: 100%;
-            border-collapse: collapse;
-            margin: 20px 0;
-        }}
-        th, td {{
-            padding: 12px;
-            text-align: left;
-            border: 1px solid #ddd;
-        }}
-        th {{
-            background-color: #3498db;
-            color: white;
-            font-weight: bold;
-        }}
-        tr:nth-child(even) {{
-            background-color: #f2f2f2;
-        }}
-        .methodology {{
-            background-color: #e8f8f5;
-            padding: 20px;
-            border-radius: 8px;
-            border-left: 5px solid #27ae60;
-            margin-top: 40px;
-        }}
-    </style>
-</head>
-<body>
-    <h1>{report['metadata']['title']}</h1>
-    
-    <div class="metadata">
-        <p><strong>생성일:</strong> {report['metadata']['generated_date']}</p>
-        <p><strong>버전:</strong> {report['metadata']['version']}</p>
-        <p><strong>리포트 ID:</strong> {report['metadata']['report_id']}</p>
-        <p><strong>분석 기간:</strong> {report['metadata']['analysis_period']}</p>
-    </div>
-    
-    <div class="description">
-        <h3>보고서 설명</h3>
-        <p>{report['metadata']['description']}</p>
-    </div>
-    
-    <div class="section">
-        <h2>{report['summary']['title']}</h2>
-        <div class="section-content">
-            {self._format_text_to_html(report['summary']['content'])}
-        </div>
-    </div>
-    
-    <div class="section">
-        <h2>{report['market_analysis']['title']}</h2>
-        <div class="section-content">
-            {self._format_text_to_html(report['market_analysis']['content'])}
-        </div>
-    </div>
-    
-    <div class="section">
-        <h2>{report['consumer_analysis']['title']}</h2>
-        <div class="section-content">
-            {self._format_text_to_html(report['consumer_analysis']['content'])}
-        </div>
-    </div>
-    
-    <div class="section">
-        <h2>{report['company_analysis']['title']}</h2>
-        <div class="section-content">
-            {self._format_text_to_html(report['company_analysis']['content'])}
-        </div>
-    </div>
-    
-    <div class="section">
-        <h2>{report['technology_analysis']['title']}</h2>
-        <div class="section-content">
-            {self._format_text_to_html(report['technology_analysis']['content'])}
-        </div>
-    </div>
-    
-    <div class="section">
-        <h2>{report['stock_analysis']['title']}</h2>
-        <div class="section-content">
-            {self._format_text_to_html(report['stock_analysis']['content'])}
-        </div>
-    </div>
-    
+    def _format_as_html(self, report: Dict, out: Optional[TextIO] = None) -> Optional[str]:
+        """HTML 형식으로 변환
+        
+        Args:
+            report: 최종 리포트 딕셔너리
+            out: 지정 시 전체 문자열을 만들지 않고 조각 단위로 기록할 파일 객체
+            
+        Returns:
+            out이 없으면 HTML 문자열, 있으면 None
         """
+        chunks = self._iter_html_chunks(report)
+        
+        if out is None:
+            return ''.join(chunks)
         
-        # 차트 섹션 추가
+        for chunk in chunks:
+            out.write(chunk)
+        return None
+    
+    def _iter_html_chunks(self, report: Dict) -> Iterator[str]:
+        """HTML 리포트를 섹션/참고 자료 단위 조각으로 생성"""
+        # 차트 섹션
+        chart_html = ''
         try:
             chart_html = self._add_stock_charts_to_html(report)
             if chart_html:
-                html += chart_html
                 self.logger.info("✅ 주가 차트가 HTML 보고서에 추가되었습니다")
             else:
                 self.logger.warning("⚠️ 주가 차트 HTML 섹션이 비어있습니다")
@@ -1205,71 +1319,102 @@ Tavily API를 통해 최신 웹 정보를 수집하고, OpenAI GPT-4를 활용
             import traceback
             traceback.print_exc()
         
-        html += f"""
-    
-    <div class="section">
-        <h2>{report['future_outlook']['title']}</h2>
-        <div class="section-content">
-            {self._format_text_to_html(report['future_outlook']['content'])}
-        </div>
-    </div>
-    
-    <div class="references">
-        <h2>{report['references']['title']}</h2>
-        <h3>참고한 문헌 및 사이트</h3>
-"""
+        values = self._flatten_report_for_html(report)
+        
+        yield _REPORT_HTML_HEAD.substitute(values)
+        yield chart_html
+        yield _REPORT_HTML_MIDDLE.substitute(values)
         
+        # 참고 자료 블록
         for i, source in enumerate(report['references']['sources'], 1):
-            html += f"""
-        <div class="reference-item">
-            <h4>{i}. {source['name']}</h4>
-            <p><strong>유형:</strong> {source['type']}</p>
-            <p><strong>설명:</strong> {source['description']}</p>
-"""
-            if 'url' in source:
-                html += f"            <p><strong>URL:</strong> <a href=\"{source['url']}\" target=\"_blank\">{source['url']}</a></p>\n"
-            if 'note' in source:
-                html += f"            <p><strong>비고:</strong> {source['note']}</p>\n"
-            html += "        </div>\n"
+            yield _format_reference_html(i, source)
         
-        html += f"""
-    </div>
+        yield _REPORT_HTML_TAIL.substitute(values)
     
-    <div class="methodology">
-        <h2>분석 방법론</h2>
-        <p>{report['methodology']}</p>
-    </div>
-</body>
-</html>"""
+    @staticmethod
+    def render_html_reports(reports: List[Dict], max_workers: Optional[int] = None) -> List[str]:
+        """여러 리포트를 프로세스 풀에서 병렬로 HTML 변환 (배치 생성용)
         
-        return html
+        Args:
+            reports: _assemble_final_report 형식의 리포트 딕셔너리 리스트
+            max_workers: 워커 프로세스 수 (None이면 CPU 코어 수)
+            
+        Returns:
+            입력 순서와 동일한 HTML 문자열 리스트
+        """
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(_render_one, reports))
+    
+    def _flatten_report_for_html(self, report: Dict) -> Dict[str, str]:
+        """HTML 템플릿 치환용 평면 딕셔너리 생성"""
+        fmt = format_text_to_html  # 섹션마다 반복되는 전역 이름 조회 제거
+        metadata = report['metadata']
+        values = {
+            'title': metadata['title'],
+            'css_href': f"{_REPORT_CSS_FILENAME}?v={_REPORT_CSS_HASH[:12]}",
+            'generated_date': metadata['generated_date'],
+            'version': metadata['version'],
+            'report_id': metadata['report_id'],
+            'analysis_period': metadata['analysis_period'],
+            'description': metadata['description'],
+            'references_title': report['references']['title'],
+            'methodology': report['methodology']
+        }
+        
+        try:
+            values.update(self._get_section_renderer(_HTML_SECTION_KEYS)(report, fmt))
+        except (KeyError, TypeError):
+            # 섹션이 누락된 리포트는 일반 경로로 처리
+            self.logger.warning("일부 리포트 섹션이 누락되어 기본 경로로 HTML을 생성합니다")
+            for key in _HTML_SECTION_KEYS:
+                section = report.get(key) or {}
+                values[f'{key}_title'] = section.get('title', '')
+                values[f'{key}_html'] = fmt(section.get('content', ''))
+        
+        return values
+    
+    @classmethod
+    def _get_section_renderer(cls, section_keys: tuple):
+        """섹션 키 구성에 특화된 렌더러를 생성하여 클래스에 캐싱
+        
+        섹션별 dict 조회를 풀어 쓴 함수 소스를 만들어 한 번만 compile 합니다.
+        """
+        renderer = cls._section_renderers.get(section_keys)
+        if renderer is None:
+            lines = ['def _render_sections(r, fmt):', '    return {']
+            for key in section_keys:
+                lines.append(f"        {key + '_title'!r}: r[{key!r}]['title'],")
+                lines.append(f"        {key + '_html'!r}: fmt(r[{key!r}]['content']),")
+            lines.append('    }')
+            
+            namespace = {}
+            exec(compile('\n'.join(lines), '<report_section_renderer>', 'exec'), namespace)
+            renderer = cls._section_renderers[section_keys] = namespace['_render_sections']
+        return renderer
+    
+    @staticmethod
+    def write_report(path, html: str):
+        """HTML 리포트를 큰 버퍼(128 KiB)로 기록하여 write 호출 횟수 감소"""
+        with open(path, 'w', encoding='utf-8', buffering=_REPORT_WRITE_BUFFER) as f:
+            f.write(html)
+    
+    def _write_report_css(self) -> Path:
+        """공통 CSS 파일 기록 (내용이 바뀐 경우에만 덮어쓰기)"""
+        css_path = self.output_dir / _REPORT_CSS_FILENAME
+        
+        if css_path.exists():
+            existing_hash = hashlib.sha256(css_path.read_bytes()).hexdigest()
+            if existing_hash == _REPORT_CSS_HASH:
+                return css_path
+        
+        # 줄바꿈 변환 없이 기록해 디스크 내용이 _REPORT_CSS_HASH(?v= 값)와 항상 일치하도록 함
+        css_path.write_bytes(_REPORT_CSS.encode('utf-8'))
+        self.logger.info(f"리포트 CSS 저장 완료: {css_path}")
+        return css_path
     
     def _format_text_to_html(self, text: str) -> str:
         """텍스트를 HTML로 변환 (줄바꿈 및 포맷팅)"""
-        # 문단 분리
-        paragraphs = text.split('\n\n')
-        html_paragraphs = []
-        
-        for para in paragraphs:
-            para = para.strip()
-            if not para:
-                continue
-            
-            # 표 형식 감지 (|로 시작하는 경우)
-            if para.startswith('|'):
-                # 표를 HTML 테이블로 변환
-                html_paragraphs.append(self._convert_table_to_html(para))
-            # 번호 매기기 목록 감지
-            elif para.startswith(('1.', '2.', '3.', '4.', '5.')):
-                html_paragraphs.append(f'<p>{para}</p>')
-            # 일반 문단
-            else:
-                # 굵은 글씨 변환 (**text** → <strong>text</strong>)
-                para = para.replace('**', '<strong>', 1)
-                para = para.replace('**', '</strong>', 1)
-                html_paragraphs.append(f'<p>{para}</p>')
-        
-        return '\n'.join(html_paragraphs)
+        return format_text_to_html(text)
     
     def _add_stock_charts_to_html(self, report: Dict) -> str:
         """주가 차트를 HTML에 추가"""
@@ -1356,33 +1501,7 @@ Tavily API를 통해 최신 웹 정보를 수집하고, OpenAI GPT-4를 활용
     
     def _convert_table_to_html(self, table_text: str) -> str:
         """마크다운 표를 HTML 테이블로 변환"""
-        lines = table_text.strip().split('\n')
-        
-        html = '<table>\n'
-        
-        for i, line in enumerate(lines):
-            # 구분선 무시
-            if '---' in line or '===' in line:
-                continue
-            
-            cells = [cell.strip() for cell in line.split('|') if cell.strip()]
-            
-            if i == 0:
-                # 헤더
-                html += '  <thead>\n    <tr>\n'
-                for cell in cells:
-                    html += f'      <th>{cell}</th>\n'
-                html += '    </tr>\n  </thead>\n  <tbody>\n'
-            else:
-                # 데이터 행
-                html += '    <tr>\n'
-                for cell in cells:
-                    html += f'      <td>{cell}</td>\n'
-                html += '    </tr>\n'
-        
-        html += '  </tbody>\n</table>'
-        
-        return html
+        return convert_table_to_html(table_text)
     
     def _generate_pdf_report(self, html_content: str, report_data: Dict, timestamp: str) -> str:
         """HTML을 PDF로 변환하여 reports/ 디렉토리에 저장"""
@@ -1651,7 +1770,25 @@ Tavily API를 통해 최신 웹 정보를 수집하고, OpenAI GPT-4를 활용
         </style>
         """
         
-        # </head> 태그 앞에 PDF 스타일 삽입
-        html_content = html_content.replace('</style>\n</head>', '</style>\n' + pdf_styles + '\n</head>')
+        # PDF는 문자열에서 렌더링하므로 외부 CSS 링크를 인라인 스타일로 교체하고 PDF 스타일 추가
+        html_content = re.sub(
+            r'<link rel="stylesheet" href="[^"]*">',
+            lambda _: f'<style>\n{_REPORT_CSS}</style>\n{pdf_styles}',
+            html_content,
+            count=1
+        )
         
-        return html_content
\ No newline at end of file
+        return html_content
+
+
+# 배치 렌더링용 워커 (프로세스마다 Agent 한 번만 생성)
+_render_agent: Optional[ReportGenerationAgent] = None
+
+
+def _render_one(report: Dict) -> str:
+    """프로세스 풀 작업 단위 - 리포트 하나를 HTML로 변환"""
+    global _render_agent
+    if _render_agent is None:
+        _render_agent = ReportGenerationAgent()
+        _render_agent.state = {}
+    return _render_agent._format_as_html(report)
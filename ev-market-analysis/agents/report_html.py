@@ -0,0 +1,83 @@
+# 리포트 HTML 변환 헬퍼
+# agents/report_html.py
+"""
+리포트 본문(Markdown 유사 텍스트)을 HTML로 변환하는 순수 함수 모음
+
+Cython pure Python 모드로 그대로 컴파일할 수 있도록 외부 상태 없이 작성되어 있습니다.
+    cythonize -i agents/report_html.py
+컴파일된 확장 모듈이 있으면 동일한 모듈명으로 우선 import 됩니다.
+"""
+
+import re
+from functools import lru_cache
+from html import escape as _html_escape
+
+# 빈 줄로 구분된 문단 (연속된 비어있지 않은 줄 묶음)
+_PARA_RE = re.compile(r'[^\n]+(?:\n(?!\n)[^\n]+)*')
+
+# 번호 매기기 목록 문단 감지 (1. 2. ... 10. 등)
+_NUMLIST_RE = re.compile(r'\d+\.')
+
+# 굵은 글씨 마크업 (**text** → <strong>text</strong>)
+_BOLD_RE = re.compile(r'\*\*(.+?)\*\*')
+
+
+@lru_cache(maxsize=256)
+def format_text_to_html(text: str) -> str:
+    """텍스트를 HTML로 변환 (줄바꿈 및 포맷팅, HTML 이스케이프) - 순수 함수이므로 결과 캐싱"""
+    html_paragraphs = []
+    
+    # 문단 단위로 순차 매칭 (전체 문단 리스트를 미리 만들지 않음)
+    for match in _PARA_RE.finditer(text):
+        para = match.group().strip()
+        if not para:
+            continue
+        
+        # 표 형식 감지 (|로 시작하는 경우)
+        if para.startswith('|'):
+            # 표를 HTML 테이블로 변환
+            html_paragraphs.append(convert_table_to_html(para))
+        # 번호 매기기 목록 감지
+        elif _NUMLIST_RE.match(para):
+            html_paragraphs.append(f'<p>{_html_escape(para, quote=False)}</p>')
+        # 일반 문단
+        else:
+            # 원문 이스케이프 후 굵은 글씨 변환 (**text** → <strong>text</strong>)
+            para = _BOLD_RE.sub(r'<strong>\1</strong>', _html_escape(para, quote=False))
+            html_paragraphs.append(f'<p>{para}</p>')
+    
+    return '\n'.join(html_paragraphs)
+
+
+def convert_table_to_html(table_text: str) -> str:
+    """마크다운 표를 HTML 테이블로 변환"""
+    lines = table_text.strip().split('\n')
+    
+    out = ['<table>\n']
+    append = out.append
+    
+    for i, line in enumerate(lines):
+        # 구분선 무시
+        if '---' in line or '===' in line:
+            continue
+        
+        # 셀마다 strip은 한 번만, 양 끝의 빈 셀은 분리 전에 제거
+        stripped = (cell.strip() for cell in line.strip().strip('|').split('|'))
+        cells = [_html_escape(cell, quote=False) for cell in stripped if cell]
+        
+        if i == 0:
+            # 헤더
+            append('  <thead>\n    <tr>\n')
+            for cell in cells:
+                append(f'      <th>{cell}</th>\n')
+            append('    </tr>\n  </thead>\n  <tbody>\n')
+        else:
+            # 데이터 행
+            append('    <tr>\n')
+            for cell in cells:
+                append(f'      <td>{cell}</td>\n')
+            append('    </tr>\n')
+    
+    append('  </tbody>\n</table>')
+    
+    return ''.join(out)
@@ -1,12 +1,22 @@
 # 주가 분석 Agent - yfinance를 활용한 실제 주가 데이터 수집
 # agents/stock_analysis_agent.py
 
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, List, Tuple, NamedTuple
 import asyncio
+import copy
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from functools import partial
+from operator import attrgetter
+from pathlib import Path
+import json
 import os
+import re
+import time
 from tavily import TavilyClient
 from .base_agent import BaseAgent
+from .file_cache import FileCache
+import numpy as np
 import pandas as pd
 
 try:
@@ -16,44 +26,349 @@ except ImportError:
     YFINANCE_AVAILABLE = False
     print("⚠️  경고: yfinance가 설치되지 않았습니다. pip install yfinance를 실행하세요.")
 
+try:
+    from numba import njit
+except ImportError:
+    # numba가 없으면 같은 루프를 순수 파이썬으로 실행
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# 가격 변동률 구간: (키, 거슬러 올라갈 거래일 수)
+_PRICE_CHANGE_OFFSETS = (
+    ('1d_change', 2),
+    ('1w_change', 5),
+    ('1m_change', 21),
+    ('3m_change', 63),
+    ('6m_change', 126)
+)
+_PRICE_CHANGE_LAGS = np.array([lag for _, lag in _PRICE_CHANGE_OFFSETS])
+
+# LLM 응답에서 JSON 객체를 추출하는 패턴
+_JSON_RE = re.compile(r'\{[^}]+\}')
+
+# Ticker 속성 접근자 (to_thread 호출마다 클로저를 만들지 않도록 재사용)
+_get_info = attrgetter('info')
+_get_recommendations = attrgetter('recommendations')
+
+# Yahoo 애널리스트 추천 컬럼 → 평가 키
+_REC_COL_MAP = {
+    'strongBuy': 'strong_buy',
+    'buy': 'buy',
+    'hold': 'hold',
+    'sell': 'sell',
+    'strongSell': 'strong_sell'
+}
+# 평가 키 순서 (강력매수 → 강력매도, StockTable.ratings 열 순서)
+_RATING_KEYS = tuple(_REC_COL_MAP.values())
+
+# 시뮬레이션 난수 범위 (열 순서는 _simulate_stocks 참고)
+_SIM_UNIFORM_LOW = np.array([10, -0.05, -0.05, -0.10, -0.15, -0.25, -0.30, -0.20, 15, -0.1])
+_SIM_UNIFORM_HIGH = np.array([300, 0.05, 0.05, 0.10, 0.15, 0.25, 0.50, 0.40, 100, 0.5])
+_SIM_INTEGER_LOW = np.array([10_000_000, 10_000_000, 100_000_000])
+_SIM_INTEGER_HIGH = np.array([100_000_001, 100_000_001, 1_000_000_001])  # randint와 같이 상한 포함
+
+# yf.download 한 번에 묶어 요청할 최대 티커 수 (Yahoo 엔드포인트 한도)
+_YF_DOWNLOAD_BATCH = 20
+
+# 리스크 경고 기준 (연율화 30일 변동성, RSI 과매수)
+_HIGH_VOLATILITY = 0.4
+_OVERBOUGHT_RSI = 70
+
+# 세부 업종 그룹 (상관관계 분석에서 그룹 내 평균 상관계수 계산용)
+_SUBSECTORS = (
+    ('chinese_ev', frozenset({'NIO', 'XPEV', 'LI', '1211.HK', '0175.HK'})),
+    ('traditional_oem', frozenset({
+        'F', 'GM', 'STLA', 'VOW3.DE', 'MBG.DE', 'BMW.DE', 'RNO.PA',
+        '7201.T', '7203.T', '005380.KS', '000270.KS'
+    })),
+    ('pure_play', frozenset({'TSLA', 'RIVN', 'LCID', 'PSNY', 'FSR', 'ARVL', 'GOEV', 'RIDE'}))
+)
+# 티커 → 세부 업종 번호 (그룹에 없는 티커는 -1)
+_SUBSECTOR_OF = {ticker: sid for sid, (_, group) in enumerate(_SUBSECTORS) for ticker in group}
+
+@njit(cache=True)
+def _tech_kernel(close):
+    """종가 배열을 한 번 순회하며 기술적 지표를 동시에 계산
+    
+    반환: (rsi, ma_50, ma_200, macd - signal, bb_upper, bb_lower, support, resistance)
+    데이터가 부족한 지표는 NaN
+    """
+    n = close.shape[0]
+    nan = np.nan
+    
+    rsi_period = 14
+    bb_period = 20
+    alpha_12 = 2.0 / 13.0
+    alpha_26 = 2.0 / 27.0
+    alpha_9 = 2.0 / 10.0
+    
+    sum_50 = 0.0
+    sum_200 = 0.0
+    gain_sum = 0.0
+    loss_sum = 0.0
+    # 볼린저 밴드 구간(최근 20일)의 Welford 평균/분산 및 최저/최고가
+    bb_count = 0
+    bb_mean = 0.0
+    bb_m2 = 0.0
+    low_20 = np.inf
+    high_20 = -np.inf
+    
+    ema_12 = close[0] if n > 0 else 0.0
+    ema_26 = ema_12
+    signal = 0.0
+    
+    for i in range(n):
+        x = close[i]
+        
+        # MACD: adjust=False 지수이동평균 (첫 값으로 초기화)
+        if i > 0:
+            ema_12 += alpha_12 * (x - ema_12)
+            ema_26 += alpha_26 * (x - ema_26)
+            macd = ema_12 - ema_26
+            signal += alpha_9 * (macd - signal)
+        
+        if i >= n - 200:
+            sum_200 += x
+        if i >= n - 50:
+            sum_50 += x
+        
+        if i >= n - bb_period:
+            bb_count += 1
+            delta = x - bb_mean
+            bb_mean += delta / bb_count
+            bb_m2 += delta * (x - bb_mean)
+            if x < low_20:
+                low_20 = x
+            if x > high_20:
+                high_20 = x
+        
+        # RSI: 최근 14개 가격 변화의 평균 상승폭/하락폭
+        if i > 0 and i >= n - rsi_period:
+            change = x - close[i - 1]
+            if change > 0:
+                gain_sum += change
+            else:
+                loss_sum -= change
+    
+    rsi = nan
+    if n > rsi_period:
+        if loss_sum == 0.0:
+            rsi = 100.0 if gain_sum > 0.0 else nan
+        else:
+            rsi = 100.0 - 100.0 / (1.0 + gain_sum / loss_sum)
+    
+    ma_50 = sum_50 / 50.0 if n >= 50 else nan
+    ma_200 = sum_200 / 200.0 if n >= 200 else nan
+    macd_diff = (ema_12 - ema_26) - signal if n >= 26 else nan
+    
+    bb_upper = nan
+    bb_lower = nan
+    support = nan
+    resistance = nan
+    if n >= bb_period:
+        std = (bb_m2 / (bb_period - 1)) ** 0.5
+        bb_upper = bb_mean + 2.0 * std
+        bb_lower = bb_mean - 2.0 * std
+        support = low_20
+        resistance = high_20
+    
+    return rsi, ma_50, ma_200, macd_diff, bb_upper, bb_lower, support, resistance
+
+
+@njit(cache=True)
+def _max_drawdown(returns):
+    """일간 수익률을 한 번 순회하며 최대 낙폭 계산 (중간 배열 없음)"""
+    cumulative = 1.0
+    running_max = 1.0
+    max_dd = 0.0
+    for i in range(returns.shape[0]):
+        cumulative *= 1.0 + returns[i]
+        if cumulative > running_max:
+            running_max = cumulative
+        dd = (cumulative - running_max) / running_max
+        if dd < max_dd:
+            max_dd = dd
+    return max_dd
+
+
+def _prefix_sums(values: np.ndarray):
+    """누적합 / 누적 제곱합 (앞에 0을 붙여 구간 합을 O(1)로 계산)"""
+    cs = np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+    cs2 = np.concatenate(([0.0], np.cumsum(np.square(values, dtype=np.float64))))
+    return cs, cs2
+
+
+def _tail_mean(cs: np.ndarray, k: int) -> float:
+    """누적합으로 마지막 k개 구간 평균 계산"""
+    n = cs.shape[0] - 1
+    return (cs[n] - cs[n - k]) / k
+
+
+def _nan_prefix_sums(values: np.ndarray):
+    """NaN을 건너뛰는 누적합 / 누적 유효 개수 (pandas mean의 skipna와 같은 평균용)"""
+    valid = ~np.isnan(values)
+    cs = np.concatenate(([0.0], np.cumsum(np.where(valid, values, 0.0))))
+    counts = np.concatenate(([0], np.cumsum(valid)))
+    return cs, counts
+
+
+def _range_nanmean(cs: np.ndarray, counts: np.ndarray, start: int, stop: int) -> float:
+    """NaN 제외 누적합으로 [start, stop) 구간 평균 계산 (유효 값이 없으면 NaN)"""
+    valid = counts[stop] - counts[start]
+    return (cs[stop] - cs[start]) / valid if valid else np.nan
+
+
+def _tail_std(cs: np.ndarray, cs2: np.ndarray, k: int) -> float:
+    """누적합으로 마지막 k개 구간 표본표준편차 계산 (ddof=1)"""
+    n = cs.shape[0] - 1
+    s1 = cs[n] - cs[n - k]
+    s2 = cs2[n] - cs2[n - k]
+    return max((s2 - s1 * s1 / k) / (k - 1), 0.0) ** 0.5
+
+
+# StockTable 컬럼: (필드명, 결과 dict 섹션, 키, 값이 없을 때 기본값)
+_TABLE_COLUMNS = (
+    ('one_y_change', 'price_history', '1y_change', 0.0),
+    ('one_m_change', 'price_history', '1m_change', 0.0),
+    ('pe_ratio', 'financials', 'pe_ratio', np.nan),
+    ('ps_ratio', 'financials', 'ps_ratio', np.nan),
+    ('pb_ratio', 'financials', 'pb_ratio', np.nan),
+    ('market_cap', 'financials', 'market_cap', np.nan),
+    ('rsi', 'technical_indicators', 'rsi', np.nan),
+    ('volatility_30d', 'risk_metrics', 'volatility_30d', np.nan),
+)
+
+
+@dataclass
+class StockTable:
+    """종목별 결과 dict에서 집계에 쓰는 필드만 뽑아 만든 컬럼(NumPy 배열) 테이블"""
+    tickers: List[str]
+    sectors: List[str]
+    one_y_change: np.ndarray
+    one_m_change: np.ndarray
+    pe_ratio: np.ndarray
+    ps_ratio: np.ndarray
+    pb_ratio: np.ndarray
+    market_cap: np.ndarray
+    rsi: np.ndarray
+    volatility_30d: np.ndarray
+    ratings: np.ndarray  # (N x 5) 애널리스트 평가 수, 열 순서는 _RATING_KEYS
+
+    @classmethod
+    def from_stocks(cls, stocks_data: Dict[str, Dict]) -> 'StockTable':
+        """종목별 결과 dict를 한 번만 순회해 테이블 생성 (분석 실패로 비어 있는 종목은 제외)"""
+        items = [(ticker, data) for ticker, data in stocks_data.items() if data]
+
+        def _column(section: str, key: str, default: float) -> np.ndarray:
+            values = ((data.get(section) or {}).get(key) for _, data in items)
+            return np.fromiter(
+                (default if value is None else value for value in values),
+                dtype=np.float64,
+                count=len(items)
+            )
+
+        ratings = np.array(
+            [
+                [(data.get('analyst_ratings') or {}).get(key) or 0 for key in _RATING_KEYS]
+                for _, data in items
+            ],
+            dtype=np.int64
+        ).reshape(len(items), len(_RATING_KEYS))
+        
+        return cls(
+            tickers=[ticker for ticker, _ in items],
+            sectors=[data.get('sector', 'Unknown') for _, data in items],
+            ratings=ratings,
+            **{field: _column(section, key, default) for field, section, key, default in _TABLE_COLUMNS}
+        )
+
+    def __len__(self) -> int:
+        return len(self.tickers)
+
+
+class _PearsonStats:
+    """피어슨 상관계수 충분통계량 (n, Σx, Σxy) - 수익률 행을 더하거나 빼며 갱신"""
+
+    def __init__(self, k: int):
+        self.n = 0
+        self.sx = np.zeros(k)
+        self.sxy = np.zeros((k, k))
+
+    def add(self, rows: np.ndarray, sign: int = 1):
+        """(T x k) 수익률 행 추가 (sign=-1이면 제거), O(k² T)"""
+        if rows.shape[0] == 0:
+            return
+        self.n += sign * rows.shape[0]
+        self.sx += sign * rows.sum(axis=0)
+        self.sxy += sign * (rows.T @ rows)
+
+    def corrcoef(self) -> np.ndarray:
+        """누적된 통계량으로 (k x k) 상관계수 행렬 계산, O(k²)"""
+        cov = self.n * self.sxy - np.outer(self.sx, self.sx)
+        var = np.diag(cov)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            corr = cov / np.sqrt(np.outer(var, var))
+        return np.clip(corr, -1.0, 1.0)
+
+
+class Aggregates(NamedTuple):
+    """StockTable 한 번의 집계로 얻는 섹터 성과 / 시장 감성 결과"""
+    sector_performance: Dict
+    market_sentiment: Dict
+
+
 class StockAnalysisAgent(BaseAgent):
     """주가 분석 Agent - yfinance 활용"""
     
+    # 기본 티커 맵핑 (회사명 → 티커) - 인스턴스마다 다시 만들지 않도록 클래스 상수로 유지
+    DEFAULT_TICKER_MAP = {
+        'Tesla': 'TSLA',
+        'BYD': '1211.HK',  # Hong Kong Stock Exchange
+        'Volkswagen': 'VOW3.DE',  # Frankfurt
+        'Hyundai': '005380.KS',  # Korea
+        'GM': 'GM',
+        'General Motors': 'GM',
+        'Ford': 'F',
+        'Stellantis': 'STLA',
+        'Rivian': 'RIVN',
+        'Lucid': 'LCID',
+        'NIO': 'NIO',
+        'XPeng': 'XPEV',
+        'Li Auto': 'LI',
+        'Mercedes-Benz': 'MBG.DE',
+        'BMW': 'BMW.DE',
+        'Renault': 'RNO.PA',  # Paris
+        'Nissan': '7201.T',  # Tokyo
+        'Toyota': '7203.T',
+        'Geely': '0175.HK',
+        'Kia': '000270.KS',
+        'Polestar': 'PSNY',
+        'Fisker': 'FSR',
+        'Arrival': 'ARVL',
+        'Canoo': 'GOEV',
+        'Lordstown': 'RIDE'
+    }
+    
+    # 입력 기업 목록이 없을 때 분석할 기본 기업 (상위 10개)
+    DEFAULT_COMPANIES = tuple(DEFAULT_TICKER_MAP)[:10]
+    
     def __init__(self, llm=None, config: Optional[Dict] = None):
         super().__init__("stock_analysis", llm, config)
         
-        # 기본 티커 맵핑 (회사명 → 티커)
-        self.default_ticker_map = {
-            'Tesla': 'TSLA',
-            'BYD': '1211.HK',  # Hong Kong Stock Exchange
-            'Volkswagen': 'VOW3.DE',  # Frankfurt
-            'Hyundai': '005380.KS',  # Korea
-            'GM': 'GM',
-            'General Motors': 'GM',
-            'Ford': 'F',
-            'Stellantis': 'STLA',
-            'Rivian': 'RIVN',
-            'Lucid': 'LCID',
-            'NIO': 'NIO',
-            'XPeng': 'XPEV',
-            'Li Auto': 'LI',
-            'Mercedes-Benz': 'MBG.DE',
-            'BMW': 'BMW.DE',
-            'Renault': 'RNO.PA',  # Paris
-            'Nissan': '7201.T',  # Tokyo
-            'Toyota': '7203.T',
-            'Geely': '0175.HK',
-            'Kia': '000270.KS',
-            'Polestar': 'PSNY',
-            'Fisker': 'FSR',
-            'Arrival': 'ARVL',
-            'Canoo': 'GOEV',
-            'Lordstown': 'RIDE'
-        }
-        
         # 설정에서 커스텀 티커 로드
         self.custom_tickers = config.get('tickers', {}) if config else {}
-        self.ticker_map = {**self.default_ticker_map, **self.custom_tickers}
+        
+        # 동적 검색으로 찾은 티커 캐시 (기업명 → 티커, 실패 결과는 TTL 동안만 유지)
+        self.ticker_cache_file = Path(self.config.get('ticker_cache_file', '.cache/ticker_cache.json'))
+        self.negative_ticker_ttl = self.config.get('negative_ticker_ttl', 7 * 24 * 3600)  # 초
+        self._ticker_cache = self._load_ticker_cache()
+        self.ticker_map = {
+            **self.DEFAULT_TICKER_MAP,
+            **{company: entry['ticker'] for company, entry in self._ticker_cache.items() if entry.get('ticker')},
+            **self.custom_tickers
+        }
         
         # Tavily 클라이언트 (티커 검색용)
         tavily_api_key = os.getenv('TAVILY_API_KEY')
@@ -67,11 +382,36 @@ class StockAnalysisAgent(BaseAgent):
         
         if not self.use_yfinance:
             self.logger.warning("yfinance를 사용할 수 없습니다. 시뮬레이션 데이터를 사용합니다.")
+        
+        # 실행 기준 시각 (process 시작 시 갱신)
+        self._start_run()
+        
+        # 상관관계 충분통계량 (반복 실행 시 새로 들어오거나 빠지는 거래일만 반영)
+        self._corr_state: Optional[Tuple[pd.DataFrame, _PearsonStats]] = None
+        
+        # 시뮬레이션 난수 생성기 (config의 seed를 주면 실행 결과 재현 가능)
+        self._rng = np.random.default_rng(self.config.get('seed'))
+        
+        # 종목별 캐시 ((티커, 날짜) 키, 메모리 + 디스크)
+        # - 분석 결과: 가격 기반이라 짧은 TTL
+        # - 기본 정보/애널리스트 추천: 자주 바뀌지 않아 긴 TTL (분석 결과가 만료돼도 재사용)
+        self.use_cache = self.config.get('use_cache', True)
+        self.cache_dir = Path(self.config.get('cache_dir', '.cache/stock'))
+        self.cache_ttl = self.config.get('cache_ttl', 6 * 3600)  # 초
+        self.profile_cache_ttl = self.config.get('profile_cache_ttl', 24 * 3600)  # 초
+        self._stock_cache = FileCache(self.cache_dir, ttl=self.cache_ttl)
+        
+        # 외부 API(Yahoo / Tavily / LLM) 동시 호출 수 제한 (공급자 429 방지)
+        self.max_concurrency = self.config.get('max_concurrency', 5)
+        self._api_semaphore = asyncio.Semaphore(self.max_concurrency)
     
     async def process(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """주가 분석 메인 프로세스"""
         self.logger.info("주가 분석 시작...")
         
+        # 실행 시각은 한 번만 구해 캐시 키 / 데이터 시점 / 파일명에 재사용
+        run_started = self._start_run()
+        
         try:
             # 1단계: 분석할 기업 목록 가져오기
             companies = self._get_companies_to_analyze(state)
@@ -81,40 +421,72 @@ class StockAnalysisAgent(BaseAgent):
             ticker_company_map = await self._map_companies_to_tickers(companies)
             self.logger.info(f"티커 매핑 완료: {len(ticker_company_map)}개")
             
-            # 3단계: 병렬로 주가 데이터 수집 및 분석
-            tasks = []
-            for ticker, company in ticker_company_map.items():
-                tasks.append(self._analyze_stock(ticker, company))
-            
-            stock_results = await asyncio.gather(*tasks, return_exceptions=True)
+            # 3단계: 가격 히스토리 일괄 수집 후 병렬로 주가 분석
+            if self.use_yfinance:
+                # 캐시에 있는 종목은 다운로드 대상에서 제외
+                tickers = list(ticker_company_map)
+                cached = dict(zip(tickers, await asyncio.gather(*[self._load_cached_stock(t) for t in tickers])))
+                pending = [t for t, hit in cached.items() if hit is None]
+                if len(pending) < len(tickers):
+                    self.logger.info(f"캐시 사용: {len(tickers) - len(pending)}개 종목")
+                histories = await self._batch_download_history(pending)
+                ticker_handles = await self._create_ticker_handles(pending)
+                
+                # 동시 요청 수는 세마포어로 제한하고, 끝난 종목부터 결과 수집 (캐시 조회 결과는 다시 읽지 않고 전달)
+                tasks = [
+                    self._analyze_stock_tagged(ticker, company, histories.get(ticker), ticker_handles.get(ticker),
+                                               cached.get(ticker))
+                    for ticker, company in ticker_company_map.items()
+                ]
+                stock_results = {}
+                for future in asyncio.as_completed(tasks):
+                    ticker, result = await future
+                    stock_results[ticker] = result
+            else:
+                # 시뮬레이션은 전 종목 난수를 한 번에 생성 (종목별 코루틴 불필요)
+                stock_results = dict(zip(ticker_company_map, self._simulate_stocks(ticker_company_map)))
             
-            # 4단계: 결과 통합
+            # 4단계: 결과 통합 (입력 순서 유지)
             stocks_data = {}
-            for i, (ticker, company) in enumerate(ticker_company_map.items()):
-                if not isinstance(stock_results[i], Exception):
-                    stocks_data[ticker] = stock_results[i]
+            close_series = {}
+            for ticker, company in ticker_company_map.items():
+                result = stock_results.get(ticker)
+                if not isinstance(result, Exception):
+                    stocks_data[ticker] = result
+                    # 상관관계 계산용 종가 시계열은 결과(JSON)에서 분리
+                    if isinstance(result, dict):
+                        close_series[ticker] = result.pop('_close_series', None)
                 else:
-                    self.logger.error(f"{ticker} ({company}) 분석 실패: {stock_results[i]}")
+                    self.logger.error(f"{ticker} ({company}) 분석 실패: {result}")
             
             if not stocks_data:
                 self.logger.warning("분석 가능한 주식 데이터가 없습니다.")
                 state['stock_analysis'] = {'error': '주식 데이터 수집 실패'}
                 return state
             
-            # 5단계: 섹터 분석
-            sector_analysis = await self._analyze_sector_performance(stocks_data)
+            # 5단계: 섹터 분석 + 시장 감성 (집계용 컬럼 테이블을 한 번 만들고 한 번에 집계)
+            table = StockTable.from_stocks(stocks_data)
+            aggregates = self._aggregate(table)
+            sector_analysis = aggregates.sector_performance
             
             # 6단계: 상관관계 분석
-            correlation_analysis = self._analyze_correlations(stocks_data)
+            correlation_analysis = self._analyze_correlations(stocks_data, close_series)
+            
+            # Yahoo가 베타를 주지 않는 종목(주로 비미국 종목)은 수익률 행렬에서 계산한 베타로 보완
+            for ticker, beta in correlation_analysis.get('betas', {}).items():
+                risk_metrics = (stocks_data.get(ticker) or {}).get('risk_metrics')
+                if risk_metrics is not None and risk_metrics.get('beta') is None:
+                    risk_metrics['beta'] = beta
             
             # 7단계: 투자 지표 계산
-            valuation_metrics = self._calculate_valuation_metrics(stocks_data)
+            valuation_metrics = self._calculate_valuation_metrics(table)
             
             # 8단계: LLM을 통한 투자 인사이트
             investment_insights = None
+            ticker_insights = {}
             if self.llm:
-                investment_insights = await self._generate_investment_insights(
-                    stocks_data, sector_analysis, valuation_metrics
+                investment_insights, ticker_insights = await self._generate_investment_insights(
+                    stocks_data, table, sector_analysis, valuation_metrics
                 )
             
             # 최종 분석 결과
@@ -124,16 +496,18 @@ class StockAnalysisAgent(BaseAgent):
                 'correlation_analysis': correlation_analysis,
                 'valuation_metrics': valuation_metrics,
                 'investment_insights': investment_insights,
-                'market_sentiment': self._analyze_market_sentiment(stocks_data),
+                'ticker_insights': ticker_insights,
+                'market_sentiment': aggregates.market_sentiment,
+                'risk_flags': self._identify_risks(table),
                 'data_source': 'yfinance' if self.use_yfinance else 'simulation',
-                'timestamp': self.get_timestamp()
+                'timestamp': self._run_timestamp
             }
             
             # 상태 업데이트
             state['stock_analysis'] = analysis_result
             
             # 결과 저장
-            self.save_output(analysis_result, f'stock_analysis_{datetime.now().strftime("%Y%m%d")}.json')
+            await self.asave_output(analysis_result, f'stock_analysis_{run_started.strftime("%Y%m%d")}.json')
             
             self.logger.info(f"✅ 주가 분석 완료 ({len(stocks_data)}개 종목)")
             
@@ -145,6 +519,13 @@ class StockAnalysisAgent(BaseAgent):
             
         return state
     
+    def _start_run(self) -> datetime:
+        """실행 기준 시각 갱신"""
+        now = datetime.now()
+        self._run_date = now.date()
+        self._run_timestamp = now.isoformat()
+        return now
+    
     def _get_companies_to_analyze(self, state: Dict[str, Any]) -> List[str]:
         """분석할 기업 목록 가져오기"""
         # company_analysis에서 발굴된 기업 목록 우선 사용
@@ -160,12 +541,22 @@ class StockAnalysisAgent(BaseAgent):
             return list(companies_data.keys())
         
         # 그것도 없으면 기본 티커 맵에서
-        return list(self.default_ticker_map.keys())[:10]
+        return list(self.DEFAULT_COMPANIES)
     
     async def _map_companies_to_tickers(self, companies: List[str]) -> Dict[str, str]:
         """기업명을 티커로 매핑"""
         ticker_company_map = {}
         
+        # 기존 맵에 없는 기업은 한 번에 묶어 동적으로 티커 검색
+        # (최근에 찾지 못한 기업은 TTL 동안 다시 검색하지 않음)
+        unknowns = [
+            company for company in companies
+            if company not in self.ticker_map and not self._is_known_unresolved(company)
+        ]
+        found = await self._find_tickers_for_companies(unknowns) if unknowns else {}
+        if found:
+            self._update_ticker_cache(found)
+        
         for company in companies:
             # 기존 맵에 있는지 확인
             if company in self.ticker_map:
@@ -173,8 +564,7 @@ class StockAnalysisAgent(BaseAgent):
                 ticker_company_map[ticker] = company
                 self.logger.info(f"  ✓ {company} → {ticker}")
             else:
-                # 동적으로 티커 검색
-                ticker = await self._find_ticker_for_company(company)
+                ticker = found.get(company)
                 if ticker:
                     ticker_company_map[ticker] = company
                     self.logger.info(f"  🔍 {company} → {ticker} (검색)")
@@ -183,105 +573,293 @@ class StockAnalysisAgent(BaseAgent):
         
         return ticker_company_map
     
+    def _load_ticker_cache(self) -> Dict[str, Dict]:
+        """티커 캐시 파일 로드 ({기업명: {'ticker': 티커 또는 None, 'ts': 저장 시각}})"""
+        try:
+            if self.ticker_cache_file.exists():
+                with open(self.ticker_cache_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    return {
+                        company: entry for company, entry in data.items()
+                        if isinstance(entry, dict)
+                    }
+        except Exception as e:
+            self.logger.warning(f"티커 캐시 로드 실패: {e}")
+        return {}
+    
+    def _is_known_unresolved(self, company: str) -> bool:
+        """TTL 안에서 이미 검색에 실패한 기업인지 확인"""
+        entry = self._ticker_cache.get(company)
+        return (
+            entry is not None
+            and not entry.get('ticker')
+            and time.time() - entry.get('ts', 0) < self.negative_ticker_ttl
+        )
+    
+    def _update_ticker_cache(self, found: Dict[str, Optional[str]]):
+        """검색 결과를 티커 맵과 캐시 파일에 반영 (임시 파일로 쓴 뒤 교체)"""
+        now = time.time()
+        for company, ticker in found.items():
+            self._ticker_cache[company] = {'ticker': ticker, 'ts': now}
+            if ticker:
+                self.ticker_map.setdefault(company, ticker)
+        
+        try:
+            self.ticker_cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.ticker_cache_file.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._ticker_cache, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.ticker_cache_file)
+        except Exception as e:
+            self.logger.warning(f"티커 캐시 저장 실패: {e}")
+    
     async def _find_ticker_for_company(self, company: str) -> Optional[str]:
         """웹 검색으로 기업의 티커 찾기"""
-        if not self.tavily_client or not self.llm:
-            return None
+        found = await self._find_tickers_for_companies([company])
+        return found.get(company)
+    
+    async def _limited_search(self, **kwargs) -> Dict:
+        """동시 호출 수 제한을 적용한 Tavily 검색"""
+        async with self._api_semaphore:
+            return await asyncio.to_thread(self.tavily_client.search, **kwargs)
+    
+    async def _find_tickers_for_companies(self, companies: List[str]) -> Dict[str, Optional[str]]:
+        """웹 검색 + LLM 한 번 호출로 여러 기업의 티커를 한꺼번에 찾기"""
+        if not self.tavily_client or not self.llm or not companies:
+            return {}
         
         try:
-            query = f"{company} stock ticker symbol"
-            search_results = await asyncio.to_thread(
-                self.tavily_client.search,
-                query=query,
-                max_results=3
-            )
-            
-            results_text = "\n".join([
-                f"{r.get('title', '')}: {r.get('content', '')[:150]}"
-                for r in search_results.get('results', [])[:3]
-            ])
-            
-            prompt = f"""다음 검색 결과에서 {company}의 주식 티커 심볼을 찾으세요:
+            # 기업별 검색은 동시에 실행
+            search_results = await asyncio.gather(*[
+                self._limited_search(query=f"{company} stock ticker symbol", max_results=3)
+                for company in companies
+            ], return_exceptions=True)
+            
+            sections = []
+            for company, results in zip(companies, search_results):
+                if isinstance(results, Exception):
+                    self.logger.warning(f"{company} 티커 검색 오류: {results}")
+                    results = {}
+                results_text = "\n".join([
+                    f"{r.get('title', '')}: {r.get('content', '')[:150]}"
+                    for r in results.get('results', [])[:3]
+                ])
+                sections.append(f"[{company}]\n{results_text}")
+            search_text = "\n\n".join(sections)
+            
+            example = ", ".join(f'"{company}": "TICKER"' for company in companies[:2])
+            prompt = f"""다음 검색 결과에서 각 기업의 주식 티커 심볼을 찾으세요:
 
-{results_text}
+{search_text}
 
 조건:
 1. 정확한 티커 심볼만 추출 (예: TSLA, 005380.KS, VOW3.DE)
 2. 거래소 접미사 포함 (한국: .KS, 홍콩: .HK, 독일: .DE 등)
 3. 찾을 수 없으면 null
+4. 기업명을 키로 사용하고 모든 기업을 포함
 
 JSON 형식으로만 응답:
-{{"ticker": "TSLA"}} 또는 {{"ticker": null}}"""
+{{{example}}} (찾을 수 없으면 null)"""
             
-            response = await self.llm.ainvoke(prompt)
+            async with self._api_semaphore:
+                response = await self.llm.ainvoke(prompt)
             content = response.content if hasattr(response, 'content') else str(response)
             
-            import json
-            import re
-            json_match = re.search(r'\{[^}]+\}', content)
+            json_match = _JSON_RE.search(content)
             if json_match:
                 data = json.loads(json_match.group())
-                return data.get('ticker')
+                return {
+                    company: data.get(company)
+                    for company in companies
+                }
             
         except Exception as e:
-            self.logger.error(f"{company} 티커 검색 오류: {e}")
+            self.logger.error(f"티커 일괄 검색 오류 ({', '.join(companies)}): {e}")
         
-        return None
+        return {}
     
-    async def _analyze_stock(self, ticker: str, company: str) -> Dict:
-        """개별 주식 분석"""
-        self.logger.info(f"  📈 {ticker} ({company}) 분석 중...")
+    async def _batch_download_history(self, tickers: List[str]) -> Dict[str, pd.DataFrame]:
+        """yf.download로 1년 가격 히스토리를 묶음 단위로 한 번에 수집"""
+        histories = {}
+        if not tickers:
+            return histories
         
+        batches = [
+            tickers[i:i + _YF_DOWNLOAD_BATCH]
+            for i in range(0, len(tickers), _YF_DOWNLOAD_BATCH)
+        ]
+        results = await asyncio.gather(*[
+            asyncio.to_thread(
+                yf.download,
+                tickers=" ".join(batch),
+                period="1y",
+                group_by="ticker",
+                auto_adjust=True,
+                threads=True,
+                progress=False
+            )
+            for batch in batches
+        ], return_exceptions=True)
+        
+        for batch, frame in zip(batches, results):
+            if isinstance(frame, Exception):
+                self.logger.warning(f"일괄 다운로드 실패 ({', '.join(batch)}): {frame}")
+                continue
+            if frame is None or frame.empty:
+                continue
+            
+            for ticker in batch:
+                try:
+                    # group_by="ticker" → (티커, 필드) MultiIndex 컬럼
+                    if isinstance(frame.columns, pd.MultiIndex):
+                        if ticker not in frame.columns.get_level_values(0):
+                            continue
+                        hist = frame[ticker]
+                    else:
+                        hist = frame
+                    hist = hist.dropna(how='all')
+                    if not hist.empty:
+                        histories[ticker] = hist
+                except Exception as e:
+                    self.logger.debug(f"{ticker} 히스토리 분리 오류: {e}")
+        
+        self.logger.info(f"가격 히스토리 일괄 수집: {len(histories)}/{len(tickers)}개")
+        return histories
+    
+    async def _create_ticker_handles(self, tickers: List[str]) -> Dict[str, Any]:
+        """yf.Tickers로 세션을 공유하는 Ticker 객체를 한 번에 생성"""
+        if not tickers:
+            return {}
+        try:
+            bulk = await asyncio.to_thread(yf.Tickers, " ".join(tickers))
+            return {
+                ticker: bulk.tickers[ticker.upper()]
+                for ticker in tickers
+                if ticker.upper() in bulk.tickers
+            }
+        except Exception as e:
+            self.logger.warning(f"Tickers 일괄 생성 실패, 종목별로 생성합니다: {e}")
+            return {}
+    
+    async def _analyze_stock_tagged(self, ticker: str, company: str,
+                                    hist: Optional[pd.DataFrame] = None,
+                                    stock: Optional[Any] = None,
+                                    cached: Optional[Dict] = None) -> Tuple[str, Any]:
+        """as_completed 수집용: (티커, 결과 또는 예외) 반환"""
+        try:
+            return ticker, await self._analyze_stock(ticker, company, hist, stock, cached)
+        except Exception as e:
+            return ticker, e
+    
+    async def _analyze_stock(self, ticker: str, company: str,
+                             hist: Optional[pd.DataFrame] = None,
+                             stock: Optional[Any] = None,
+                             cached: Optional[Dict] = None) -> Dict:
+        """개별 주식 분석 (cached: process()에서 미리 조회한 캐시 결과)"""
         if self.use_yfinance:
-            return await self._analyze_stock_yfinance(ticker, company)
+            if cached is not None:
+                self.logger.info(f"  💾 {ticker} ({company}) 캐시 사용")
+                return cached
+            
+            async with self._api_semaphore:
+                self.logger.info(f"  📈 {ticker} ({company}) 분석 중...")
+                result = await self._analyze_stock_yfinance(ticker, company, hist, stock)
+            if result:
+                await self._store_cached_stock(ticker, result)
+            return result
         else:
+            self.logger.info(f"  📈 {ticker} ({company}) 분석 중...")
             return self._analyze_stock_simulation(ticker, company)
     
-    async def _analyze_stock_yfinance(self, ticker: str, company: str) -> Dict:
-        """yfinance로 실제 주식 데이터 수집"""
+    async def _load_cached_stock(self, ticker: str) -> Optional[Dict]:
+        """캐시된 종목 분석 결과 조회 (없거나 만료되면 None)"""
+        if not self.use_cache:
+            return None
+        
+        cached = await self._stock_cache.get(FileCache.key('analysis', ticker, self._run_date))
+        # 호출 측에서 중첩 섹션(risk_metrics 등)을 수정해도 메모리 캐시가 바뀌지 않도록 깊은 복사
+        return copy.deepcopy(cached) if cached is not None else None
+    
+    async def _store_cached_stock(self, ticker: str, result: Dict):
+        """종목 분석 결과를 메모리/디스크 캐시에 저장"""
+        if not self.use_cache:
+            return
+        
         try:
-            # yfinance Ticker 객체 생성
-            stock = await asyncio.to_thread(yf.Ticker, ticker)
-            
-            # 1. 기본 정보
-            info = await asyncio.to_thread(lambda: stock.info)
-            
-            # 2. 가격 히스토리 (1년)
-            hist = await asyncio.to_thread(
-                lambda: stock.history(period="1y")
-            )
+            # 저장 후 호출 측이 결과를 수정해도 메모리 항목이 디스크(pickle) 항목과 달라지지 않도록 깊은 복사
+            await self._stock_cache.set(FileCache.key('analysis', ticker, self._run_date), copy.deepcopy(result))
+        except Exception as e:
+            self.logger.warning(f"{ticker} 캐시 저장 실패: {e}")
+    
+    async def _analyze_stock_yfinance(self, ticker: str, company: str,
+                                      hist: Optional[pd.DataFrame] = None,
+                                      stock: Optional[Any] = None) -> Dict:
+        """yfinance로 실제 주식 데이터 수집 (hist: 일괄 수집된 가격 히스토리, stock: 공유 Ticker 객체)"""
+        try:
+            # yfinance Ticker 객체 생성 (yf.Tickers에서 받은 객체가 없을 때만)
+            if stock is None:
+                stock = await asyncio.to_thread(yf.Ticker, ticker)
+            
+            # 기본 정보 / 애널리스트 추천 / 가격 히스토리 동시 요청
+            # (재무 지표는 info에서 추출하므로 financials/balance_sheet는 요청하지 않음,
+            #  기본 정보/추천은 프로필 캐시에 없을 때만, 가격 히스토리는 일괄 수집에서 빠진 경우에만 개별 요청)
+            profile_key = FileCache.key('profile', ticker, self._run_date)
+            profile = await self._stock_cache.get(profile_key) if self.use_cache else None
+            need_hist = hist is None or hist.empty
+            
+            fetches = {}
+            if profile is None:
+                fetches['info'] = asyncio.to_thread(_get_info, stock)
+                fetches['recommendations'] = asyncio.to_thread(_get_recommendations, stock)
+            if need_hist:
+                fetches['history'] = asyncio.to_thread(partial(stock.history, period="1y"))
+            
+            results = dict(zip(fetches, await asyncio.gather(*fetches.values(), return_exceptions=True)))
+            for name, result in results.items():
+                if isinstance(result, Exception):
+                    self.logger.warning(f"{ticker} {name} 수집 실패: {result}")
+                    results[name] = None
+            
+            if profile is None:
+                info, recommendations = results['info'] or {}, results['recommendations']
+                if info and self.use_cache:
+                    try:
+                        await self._stock_cache.set(profile_key, (info, recommendations), ttl=self.profile_cache_ttl)
+                    except Exception as e:
+                        self.logger.warning(f"{ticker} 프로필 캐시 저장 실패: {e}")
+            else:
+                info, recommendations = profile
+            if need_hist:
+                hist = results['history']
             
-            if hist.empty:
+            if hist is None or hist.empty:
                 self.logger.warning(f"{ticker}: 가격 데이터가 없습니다")
                 return None
             
-            # 3. 재무 데이터
-            financials = await asyncio.to_thread(lambda: stock.financials)
-            balance_sheet = await asyncio.to_thread(lambda: stock.balance_sheet)
-            
-            # 4. 애널리스트 추천
-            recommendations = await asyncio.to_thread(lambda: stock.recommendations)
-            
-            # 데이터 가공
-            current_price = info.get('currentPrice', hist['Close'].iloc[-1])
+            # 데이터 가공: 종가 배열과 일간 수익률은 종목당 한 번만 계산해 재사용
+            close_series = hist['Close'].dropna()
+            close_arr = close_series.to_numpy(dtype=np.float64)
+            rets = np.diff(close_arr) / close_arr[:-1]
+            current_price = info.get('currentPrice', close_arr[-1])
             
             # 가격 변동률 계산
-            price_history = self._calculate_price_changes(hist)
+            price_history = self._calculate_price_changes(close_arr, close_series.index)
             
             # 거래량 분석
             volume_analysis = self._analyze_volume(hist)
             
             # 재무 지표
-            financial_metrics = self._extract_financial_metrics(info, financials, balance_sheet)
+            financial_metrics = self._extract_financial_metrics(info)
             
             # 기술적 지표
-            technical_indicators = self._calculate_technical_indicators(hist)
+            technical_indicators = self._calculate_technical_indicators(close_arr)
             
             # 애널리스트 평가
             analyst_ratings = self._process_analyst_ratings(recommendations, info)
             
             # 리스크 지표
-            risk_metrics = self._calculate_risk_metrics(hist, info)
+            risk_metrics = self._calculate_risk_metrics(rets, info)
             
             return {
                 'company': company,
@@ -297,30 +875,38 @@ JSON 형식으로만 응답:
                 'market_cap': info.get('marketCap', 0),
                 'sector': info.get('sector', 'Unknown'),
                 'industry': info.get('industry', 'Unknown'),
-                'data_date': datetime.now().isoformat()
+                'data_date': self._run_timestamp,
+                '_close_series': close_series
             }
             
         except Exception as e:
             self.logger.error(f"{ticker} yfinance 분석 오류: {e}")
             return None
     
-    def _calculate_price_changes(self, hist) -> Dict:
+    def _calculate_price_changes(self, close: np.ndarray, index: pd.DatetimeIndex) -> Dict:
         """가격 변동률 계산"""
         try:
-            close_prices = hist['Close']
+            n = len(close)
+            last = close[-1]
+            
+            # 구간별 기준가를 한 번의 인덱싱으로 조회 (데이터가 부족한 구간은 0)
+            valid = n >= _PRICE_CHANGE_LAGS
+            base = close[np.where(valid, -_PRICE_CHANGE_LAGS, -1)]
+            period_changes = np.where(valid, (last - base) / base, 0)
             
             changes = {
-                '1d_change': (close_prices.iloc[-1] - close_prices.iloc[-2]) / close_prices.iloc[-2] if len(close_prices) > 1 else 0,
-                '1w_change': (close_prices.iloc[-1] - close_prices.iloc[-5]) / close_prices.iloc[-5] if len(close_prices) > 5 else 0,
-                '1m_change': (close_prices.iloc[-1] - close_prices.iloc[-21]) / close_prices.iloc[-21] if len(close_prices) > 21 else 0,
-                '3m_change': (close_prices.iloc[-1] - close_prices.iloc[-63]) / close_prices.iloc[-63] if len(close_prices) > 63 else 0,
-                '6m_change': (close_prices.iloc[-1] - close_prices.iloc[-126]) / close_prices.iloc[-126] if len(close_prices) > 126 else 0,
-                '1y_change': (close_prices.iloc[-1] - close_prices.iloc[0]) / close_prices.iloc[0],
-                'ytd_change': (close_prices.iloc[-1] - close_prices[close_prices.index.year == datetime.now().year].iloc[0]) / close_prices[close_prices.index.year == datetime.now().year].iloc[0] if any(close_prices.index.year == datetime.now().year) else 0,
-                '52w_high': close_prices.max(),
-                '52w_low': close_prices.min()
+                key: period_changes[i]
+                for i, (key, _) in enumerate(_PRICE_CHANGE_OFFSETS)
             }
             
+            # 연초 대비: 정렬된 인덱스에서 올해 첫 거래일 위치 탐색
+            year_start = pd.Timestamp(self._run_date.year, 1, 1, tz=getattr(index, 'tz', None))
+            ytd_pos = index.searchsorted(year_start)
+            changes['1y_change'] = (last - close[0]) / close[0]
+            changes['ytd_change'] = (last - close[ytd_pos]) / close[ytd_pos] if ytd_pos < n else 0
+            changes['52w_high'] = close.max()
+            changes['52w_low'] = close.min()
+            
             return changes
         except Exception as e:
             self.logger.error(f"가격 변동률 계산 오류: {e}")
@@ -329,19 +915,27 @@ JSON 형식으로만 응답:
     def _analyze_volume(self, hist) -> Dict:
         """거래량 분석"""
         try:
-            volumes = hist['Volume']
+            volumes = hist['Volume'].to_numpy(dtype=np.float64)
+            n = len(volumes)
+            
+            # 누적합 한 번으로 모든 구간 평균 계산 (거래량이 빠진 날(NaN)은 평균에서 제외)
+            cs, counts = _nan_prefix_sums(volumes)
             
             return {
-                'current_volume': int(volumes.iloc[-1]),
-                'avg_volume_3m': int(volumes.iloc[-63:].mean()) if len(volumes) > 63 else int(volumes.mean()),
-                'avg_volume_1m': int(volumes.iloc[-21:].mean()) if len(volumes) > 21 else int(volumes.mean()),
-                'volume_trend': self._determine_trend(volumes.iloc[-10:]) if len(volumes) > 10 else 'stable'
+                'current_volume': int(volumes[-1]),
+                'avg_volume_3m': int(_range_nanmean(cs, counts, n - 63 if n > 63 else 0, n)),
+                'avg_volume_1m': int(_range_nanmean(cs, counts, n - 21 if n > 21 else 0, n)),
+                # 최근 10일을 앞/뒤 5일로 나눠 평균 비교
+                'volume_trend': self._determine_trend(
+                    _range_nanmean(cs, counts, n - 10, n - 5),
+                    _range_nanmean(cs, counts, n - 5, n)
+                ) if n > 10 else 'stable'
             }
         except Exception as e:
             self.logger.error(f"거래량 분석 오류: {e}")
             return {'current_volume': 0, 'avg_volume_3m': 0}
     
-    def _extract_financial_metrics(self, info: Dict, financials, balance_sheet) -> Dict:
+    def _extract_financial_metrics(self, info: Dict) -> Dict:
         """재무 지표 추출"""
         try:
             return {
@@ -368,92 +962,35 @@ JSON 형식으로만 응답:
             self.logger.error(f"재무 지표 추출 오류: {e}")
             return {}
     
-    def _calculate_technical_indicators(self, hist) -> Dict:
-        """기술적 지표 계산"""
+    def _calculate_technical_indicators(self, close: np.ndarray) -> Dict:
+        """기술적 지표 계산 (RSI / 이동평균 / MACD / 볼린저 밴드를 한 번에)"""
         try:
-            close = hist['Close']
-            
-            # RSI 계산
-            rsi = self._calculate_rsi(close)
+            rsi, ma_50, ma_200, macd_diff, bb_upper, bb_lower, support, resistance = _tech_kernel(close)
             
-            # 이동평균
-            ma_50 = close.rolling(window=50).mean().iloc[-1] if len(close) >= 50 else None
-            ma_200 = close.rolling(window=200).mean().iloc[-1] if len(close) >= 200 else None
-            
-            # MACD
-            macd_signal = self._calculate_macd_signal(close)
+            if np.isnan(macd_diff) or macd_diff == 0:
+                macd_signal = 'neutral'
+            else:
+                macd_signal = 'bullish' if macd_diff > 0 else 'bearish'
             
-            # 볼린저 밴드
-            bb_upper, bb_lower = self._calculate_bollinger_bands(close)
+            # numpy 스칼라는 그대로 두고 계산 불가(NaN)만 None으로 변환
+            def _value(x):
+                return None if np.isnan(x) else x
             
             return {
-                'rsi': rsi,
-                'ma_50': ma_50,
-                'ma_200': ma_200,
+                'rsi': _value(rsi),
+                'ma_50': _value(ma_50),
+                'ma_200': _value(ma_200),
                 'macd_signal': macd_signal,
-                'bb_upper': bb_upper,
-                'bb_lower': bb_lower,
-                'current_price': close.iloc[-1],
-                'support_level': close.rolling(window=20).min().iloc[-1] if len(close) >= 20 else None,
-                'resistance_level': close.rolling(window=20).max().iloc[-1] if len(close) >= 20 else None
+                'bb_upper': _value(bb_upper),
+                'bb_lower': _value(bb_lower),
+                'current_price': close[-1],
+                'support_level': _value(support),
+                'resistance_level': _value(resistance)
             }
         except Exception as e:
             self.logger.error(f"기술적 지표 계산 오류: {e}")
             return {}
     
-    def _calculate_rsi(self, prices, period=14) -> Optional[float]:
-        """RSI 계산"""
-        try:
-            if len(prices) < period:
-                return None
-            
-            delta = prices.diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-            
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
-            
-            return float(rsi.iloc[-1])
-        except:
-            return None
-    
-    def _calculate_macd_signal(self, prices) -> str:
-        """MACD 신호 계산"""
-        try:
-            if len(prices) < 26:
-                return 'neutral'
-            
-            ema_12 = prices.ewm(span=12, adjust=False).mean()
-            ema_26 = prices.ewm(span=26, adjust=False).mean()
-            macd = ema_12 - ema_26
-            signal = macd.ewm(span=9, adjust=False).mean()
-            
-            if macd.iloc[-1] > signal.iloc[-1]:
-                return 'bullish'
-            elif macd.iloc[-1] < signal.iloc[-1]:
-                return 'bearish'
-            else:
-                return 'neutral'
-        except:
-            return 'neutral'
-    
-    def _calculate_bollinger_bands(self, prices, period=20) -> Tuple[Optional[float], Optional[float]]:
-        """볼린저 밴드 계산"""
-        try:
-            if len(prices) < period:
-                return None, None
-            
-            ma = prices.rolling(window=period).mean()
-            std = prices.rolling(window=period).std()
-            
-            upper = ma + (std * 2)
-            lower = ma - (std * 2)
-            
-            return float(upper.iloc[-1]), float(lower.iloc[-1])
-        except:
-            return None, None
-    
     def _process_analyst_ratings(self, recommendations, info: Dict) -> Dict:
         """애널리스트 평가 처리"""
         try:
@@ -488,33 +1025,13 @@ JSON 형식으로만 응답:
                 recent = recommendations.tail(20)
                 self.logger.debug(f"애널리스트 추천 데이터: {len(recent)}개 레코드")
                 
-                # 컬럼별로 집계
-                if hasattr(recent, 'columns') and recent.columns is not None:
-                    for col in recent.columns:
-                        try:
-                            col_lower = str(col).lower()
-                            col_sum = recent[col].sum()
-                            
-                            # 정수로 변환 가능한지 확인
-                            if pd.notna(col_sum):
-                                col_sum = int(col_sum)
-                            else:
-                                continue
-                            
-                            if 'strong buy' in col_lower or 'strongbuy' in col_lower:
-                                ratings['strong_buy'] += col_sum
-                            elif 'buy' in col_lower and 'strong' not in col_lower:
-                                ratings['buy'] += col_sum
-                            elif 'hold' in col_lower:
-                                ratings['hold'] += col_sum
-                            elif 'strong sell' in col_lower or 'strongsell' in col_lower:
-                                ratings['strong_sell'] += col_sum
-                            elif 'sell' in col_lower and 'strong' not in col_lower:
-                                ratings['sell'] += col_sum
-                                
-                        except (ValueError, TypeError, AttributeError) as col_error:
-                            self.logger.debug(f"컬럼 {col} 처리 중 오류: {col_error}")
-                            continue
+                # 알려진 추천 컬럼만 한 번에 합산
+                columns = [col for col in _REC_COL_MAP if col in recent.columns]
+                if columns:
+                    totals = recent[columns].sum()
+                    for col, total in totals.items():
+                        if pd.notna(total):
+                            ratings[_REC_COL_MAP[col]] += int(total)
                 
             except Exception as processing_error:
                 self.logger.warning(f"추천 데이터 처리 중 오류: {processing_error}")
@@ -536,50 +1053,41 @@ JSON 형식으로만 응답:
                 'number_of_analysts': info.get('numberOfAnalystOpinions', 0) if info else 0
             }
     
-    def _calculate_risk_metrics(self, hist, info: Dict) -> Dict:
-        """리스크 지표 계산"""
+    def _calculate_risk_metrics(self, returns: np.ndarray, info: Dict) -> Dict:
+        """리스크 지표 계산 (returns: 일간 수익률 배열)"""
         try:
-            returns = hist['Close'].pct_change().dropna()
+            cs, cs2 = _prefix_sums(returns)
             
             # 베타
             beta = info.get('beta', None)
             
             # 변동성 (30일)
-            volatility_30d = returns.iloc[-30:].std() * (252 ** 0.5) if len(returns) >= 30 else None
+            volatility_30d = _tail_std(cs, cs2, 30) * (252 ** 0.5) if len(returns) >= 30 else None
             
             # 샤프 비율 (간단 계산, 무위험 수익률 2% 가정)
             if volatility_30d and volatility_30d > 0:
-                avg_return = returns.iloc[-30:].mean() * 252 if len(returns) >= 30 else 0
+                avg_return = _tail_mean(cs, 30) * 252
                 sharpe_ratio = (avg_return - 0.02) / volatility_30d
             else:
                 sharpe_ratio = None
             
             # 최대 낙폭
-            cumulative = (1 + returns).cumprod()
-            running_max = cumulative.expanding().max()
-            drawdown = (cumulative - running_max) / running_max
-            max_drawdown = drawdown.min()
+            max_drawdown = _max_drawdown(returns) if len(returns) > 0 else np.nan
             
             return {
                 'beta': beta,
                 'volatility_30d': volatility_30d,
                 'sharpe_ratio': sharpe_ratio,
                 'max_drawdown': max_drawdown,
-                'var_95': returns.quantile(0.05) if len(returns) > 0 else None  # Value at Risk
+                'var_95': np.quantile(returns, 0.05) if len(returns) > 0 else None  # Value at Risk
             }
         except Exception as e:
             self.logger.error(f"리스크 지표 계산 오류: {e}")
             return {}
     
-    def _determine_trend(self, values) -> str:
-        """트렌드 판단"""
+    def _determine_trend(self, first_half: float, second_half: float) -> str:
+        """트렌드 판단 (앞/뒤 구간 평균 비교)"""
         try:
-            if len(values) < 3:
-                return 'stable'
-            
-            first_half = values[:len(values)//2].mean()
-            second_half = values[len(values)//2:].mean()
-            
             change = (second_half - first_half) / first_half
             
             if change > 0.1:
@@ -593,158 +1101,302 @@ JSON 형식으로만 응답:
     
     def _analyze_stock_simulation(self, ticker: str, company: str) -> Dict:
         """시뮬레이션 데이터 (yfinance 사용 불가 시)"""
-        import random
-        
-        base_price = random.uniform(10, 300)
-        
-        return {
-            'company': company,
-            'ticker': ticker,
-            'current_price': base_price * (1 + random.uniform(-0.05, 0.05)),
-            'currency': 'USD',
-            'price_history': {
-                '1d_change': random.uniform(-0.05, 0.05),
-                '1w_change': random.uniform(-0.10, 0.10),
-                '1m_change': random.uniform(-0.15, 0.15),
-                '3m_change': random.uniform(-0.25, 0.25),
-                '1y_change': random.uniform(-0.30, 0.50),
-                'ytd_change': random.uniform(-0.20, 0.40)
-            },
-            'volume': {
-                'current_volume': random.randint(10000000, 100000000),
-                'avg_volume_3m': random.randint(10000000, 100000000)
-            },
-            'financials': {
-                'market_cap': base_price * random.randint(100000000, 1000000000),
-                'pe_ratio': random.uniform(15, 100),
-                'revenue_growth': random.uniform(-0.1, 0.5)
-            },
-            'data_source': 'simulation'
-        }
+        return self._simulate_stocks({ticker: company})[0]
     
-    async def _analyze_sector_performance(self, stocks_data: Dict) -> Dict:
-        """섹터 성과 분석"""
+    def _simulate_stocks(self, ticker_company_map: Dict[str, str]) -> List[Dict]:
+        """전 종목 시뮬레이션 데이터를 (N x K) 난수 한 번으로 생성"""
+        n = len(ticker_company_map)
+        rng = self._rng
+        
+        # 열: 기준가, 현재가 변동, 1d, 1w, 1m, 3m, 1y, ytd, P/E, 매출 성장률
+        uniforms = rng.uniform(_SIM_UNIFORM_LOW, _SIM_UNIFORM_HIGH, size=(n, len(_SIM_UNIFORM_LOW))).tolist()
+        # 열: 현재 거래량, 3개월 평균 거래량, 시가총액 배수
+        integers = rng.integers(_SIM_INTEGER_LOW, _SIM_INTEGER_HIGH, size=(n, len(_SIM_INTEGER_LOW))).tolist()
+        # 열: 애널리스트 평가 수 (_RATING_KEYS 순서)
+        ratings = rng.integers(0, 15, size=(n, len(_RATING_KEYS))).tolist()
+        
+        results = []
+        for (ticker, company), u, k, r in zip(ticker_company_map.items(), uniforms, integers, ratings):
+            base_price = u[0]
+            results.append({
+                'company': company,
+                'ticker': ticker,
+                'current_price': base_price * (1 + u[1]),
+                'currency': 'USD',
+                'price_history': {
+                    '1d_change': u[2],
+                    '1w_change': u[3],
+                    '1m_change': u[4],
+                    '3m_change': u[5],
+                    '1y_change': u[6],
+                    'ytd_change': u[7]
+                },
+                'volume': {
+                    'current_volume': k[0],
+                    'avg_volume_3m': k[1]
+                },
+                'financials': {
+                    'market_cap': base_price * k[2],
+                    'pe_ratio': u[8],
+                    'revenue_growth': u[9]
+                },
+                'analyst_ratings': dict(zip(_RATING_KEYS, r)),
+                'data_source': 'simulation'
+            })
+        
+        return results
+    
+    def _aggregate(self, table: StockTable) -> Aggregates:
+        """섹터 성과와 시장 감성을 groupby 한 번으로 함께 집계"""
         try:
-            sector_performance = {}
-            
-            for ticker, data in stocks_data.items():
-                sector = data.get('sector', 'Unknown')
-                if sector not in sector_performance:
-                    sector_performance[sector] = {
-                        'stocks': [],
-                        'avg_return_1y': 0,
-                        'count': 0
-                    }
-                
-                sector_performance[sector]['stocks'].append(ticker)
-                sector_performance[sector]['avg_return_1y'] += data.get('price_history', {}).get('1y_change', 0)
-                sector_performance[sector]['count'] += 1
+            if not len(table):
+                return Aggregates({}, {})
+            
+            # 섹터별 종목 목록 / 평균 1년 수익률 / 종목 수와 1개월 등락 종목 수를 같은 groupby에서 계산
+            change_1m = table.one_m_change
+            grouped = (
+                pd.DataFrame({
+                    'ticker': table.tickers,
+                    'sector': table.sectors,
+                    'ret': table.one_y_change,
+                    'up': change_1m > 0.05,
+                    'down': change_1m < -0.05
+                })
+                .groupby('sector', sort=False)
+                .agg(
+                    stocks=('ticker', list),
+                    avg_return_1y=('ret', 'mean'),
+                    count=('ticker', 'size'),
+                    positive=('up', 'sum'),
+                    negative=('down', 'sum')
+                )
+            )
+            
+            sector_performance = {
+                sector: {
+                    'stocks': stocks,
+                    'avg_return_1y': avg_return,
+                    'count': int(count)
+                }
+                for sector, stocks, avg_return, count in grouped[['stocks', 'avg_return_1y', 'count']].itertuples(name=None)
+            }
             
-            # 평균 계산
-            for sector, data in sector_performance.items():
-                if data['count'] > 0:
-                    data['avg_return_1y'] /= data['count']
+            # 시장 감성 (1개월 수익률 ±5% 기준)
+            total = len(table)
+            positive = int(grouped['positive'].sum())
+            negative = int(grouped['negative'].sum())
+            # 애널리스트 평가는 (N x 5) 배열의 열 합계 한 번으로 집계
+            rating_sums = table.ratings.sum(axis=0)
+            total_ratings = int(rating_sums.sum())
+            bullish = int(rating_sums[:2].sum())
+            bearish = int(rating_sums[3:].sum())
+            
+            market_sentiment = {
+                'positive': positive,
+                'negative': negative,
+                'neutral': total - positive - negative,
+                'positive_ratio': positive / total,
+                'sentiment': 'bullish' if positive > negative else 'bearish' if negative > positive else 'neutral',
+                'analyst_consensus': {
+                    'bullish': bullish,
+                    'neutral': int(rating_sums[2]),
+                    'bearish': bearish,
+                    'bullish_ratio': bullish / total_ratings if total_ratings > 0 else 0
+                }
+            }
             
-            return sector_performance
+            return Aggregates(sector_performance, market_sentiment)
         except Exception as e:
-            self.logger.error(f"섹터 분석 오류: {e}")
-            return {}
+            self.logger.error(f"섹터/시장 감성 분석 오류: {e}")
+            return Aggregates({}, {})
     
-    def _analyze_correlations(self, stocks_data: Dict) -> Dict:
-        """상관관계 분석 (간단 버전)"""
+    def _analyze_correlations(self, stocks_data: Dict,
+                              close_series: Optional[Dict[str, pd.Series]] = None) -> Dict:
+        """상관관계 분석 (일간 수익률 피어슨 상관계수 행렬)"""
         try:
-            # 1년 수익률 기반 상관관계
-            tickers = list(stocks_data.keys())
             returns = {
                 ticker: data.get('price_history', {}).get('1y_change', 0)
                 for ticker, data in stocks_data.items()
+                if data
             }
             
-            return {
-                'note': '상관관계 분석은 실제 구현 시 pandas로 계산',
-                'returns': returns
+            series = {
+                ticker: self._to_date_index(s)
+                for ticker, s in (close_series or {}).items()
+                if s is not None and len(s) > 2
             }
-        except Exception as e:
-            self.logger.error(f"상관관계 분석 오류: {e}")
-            return {}
-    
-    def _calculate_valuation_metrics(self, stocks_data: Dict) -> Dict:
-        """밸류에이션 지표 계산"""
-        try:
-            pe_ratios = []
-            ps_ratios = []
-            pb_ratios = []
+            if len(series) < 2:
+                return {
+                    'note': '상관관계 계산에 필요한 가격 데이터 부족',
+                    'returns': returns
+                }
+            
+            # 거래소별 휴장일이 달라 공통 거래일만 남겨 (T x N) 종가 행렬 구성
+            aligned = pd.concat(series, axis=1, join='inner').dropna()
+            closes = aligned.to_numpy(dtype=np.float64)
+            if closes.shape[0] < 3:
+                return {
+                    'note': '공통 거래일 부족으로 상관관계 계산 불가',
+                    'returns': returns
+                }
+            
+            rets = np.diff(closes, axis=0) / closes[:-1]
+            tickers = list(aligned.columns)
+            corr = self._update_correlation_stats(
+                pd.DataFrame(rets, index=aligned.index[1:], columns=tickers)
+            )
             
-            for data in stocks_data.values():
-                financials = data.get('financials', {})
-                
-                pe = financials.get('pe_ratio')
-                if pe and pe > 0:
-                    pe_ratios.append(pe)
-                
-                ps = financials.get('ps_ratio')
-                if ps and ps > 0:
-                    ps_ratios.append(ps)
-                
-                pb = financials.get('pb_ratio')
-                if pb and pb > 0:
-                    pb_ratios.append(pb)
+            benchmark = self.config.get('beta_benchmark', 'TSLA')
+            
+            # 상삼각 인덱스로 종목 쌍별 상관계수를 한 번에 추출
+            rows, cols = np.triu_indices(len(tickers), k=1)
+            upper = corr[rows, cols]
+            pair_names = [f"{tickers[i]}_vs_{tickers[j]}" for i, j in zip(rows.tolist(), cols.tolist())]
+            pairs = dict(zip(pair_names, np.round(upper, 4).tolist()))
+            
+            # 가장 높은/낮은 상관 쌍은 상삼각 배열의 argmax/argmin으로 바로 선택 (NaN 쌍 제외)
+            if np.isfinite(upper).any():
+                most_correlated = pair_names[int(np.nanargmax(upper))]
+                least_correlated = pair_names[int(np.nanargmin(upper))]
+            else:
+                most_correlated = least_correlated = None
+            
+            # 세부 업종 내 평균 상관계수 (쌍의 두 종목이 같은 그룹일 때만 포함)
+            groups = np.array([_SUBSECTOR_OF.get(t, -1) for t in tickers])
+            row_groups = groups[rows]
+            same_group = row_groups == groups[cols]
+            subsector_correlation = {}
+            for sid, (name, _) in enumerate(_SUBSECTORS):
+                values = upper[same_group & (row_groups == sid)]
+                values = values[np.isfinite(values)]
+                if values.size:
+                    subsector_correlation[name] = round(float(values.mean()), 4)
             
             return {
-                'avg_pe': sum(pe_ratios) / len(pe_ratios) if pe_ratios else None,
-                'median_pe': sorted(pe_ratios)[len(pe_ratios)//2] if pe_ratios else None,
-                'avg_ps': sum(ps_ratios) / len(ps_ratios) if ps_ratios else None,
-                'avg_pb': sum(pb_ratios) / len(pb_ratios) if pb_ratios else None,
-                'sample_size': len(stocks_data)
+                'tickers': tickers,
+                'matrix': np.round(corr, 4).tolist(),
+                'pairs': pairs,
+                'most_correlated': most_correlated,
+                'least_correlated': least_correlated,
+                'subsector_correlation': subsector_correlation,
+                'observations': int(rets.shape[0]),
+                'returns': returns,
+                'beta_benchmark': benchmark if benchmark in tickers else None,
+                'betas': self._calculate_betas(rets, tickers, benchmark)
             }
         except Exception as e:
-            self.logger.error(f"밸류에이션 지표 계산 오류: {e}")
+            self.logger.error(f"상관관계 분석 오류: {e}")
             return {}
     
-    def _analyze_market_sentiment(self, stocks_data: Dict) -> Dict:
-        """시장 감성 분석"""
+    def _update_correlation_stats(self, returns: pd.DataFrame) -> np.ndarray:
+        """직전 실행의 충분통계량을 재사용해 상관계수 행렬 계산
+        
+        종목 구성이 같고 겹치는 거래일의 수익률이 그대로면, 새 거래일은 더하고
+        윈도우에서 빠진 거래일은 빼기만 함 (그 외에는 전체 재계산)
+        """
+        state = self._corr_state
+        stats = None
+        if state is not None:
+            previous, stats = state
+            overlap = returns.index.intersection(previous.index)
+            if (
+                list(previous.columns) != list(returns.columns)
+                or not np.array_equal(previous.loc[overlap].to_numpy(), returns.loc[overlap].to_numpy())
+            ):
+                stats = None
+            else:
+                stats.add(previous.loc[~previous.index.isin(overlap)].to_numpy(), sign=-1)
+                stats.add(returns.loc[~returns.index.isin(overlap)].to_numpy())
+        
+        if stats is None:
+            stats = _PearsonStats(returns.shape[1])
+            stats.add(returns.to_numpy())
+        
+        self._corr_state = (returns, stats)
+        return stats.corrcoef()
+    
+    @staticmethod
+    def _calculate_betas(rets: np.ndarray, tickers: List[str], benchmark: str) -> Dict[str, float]:
+        """(T x N) 수익률 행렬에서 기준 종목 대비 전 종목 베타를 한 번에 계산"""
+        if benchmark not in tickers:
+            return {}
+        
+        market = rets[:, tickers.index(benchmark)]
+        market_var = market.var()
+        if market_var == 0:
+            return {}
+        
+        # beta_i = cov(r_i, r_m) / var(r_m)
+        cov = (rets - rets.mean(axis=0)).T @ (market - market.mean()) / rets.shape[0]
+        return dict(zip(tickers, np.round(cov / market_var, 4).tolist()))
+    
+    @staticmethod
+    def _to_date_index(series: pd.Series) -> pd.Series:
+        """시간대가 섞인 인덱스를 날짜 기준으로 통일"""
+        index = pd.DatetimeIndex(series.index)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        return pd.Series(series.to_numpy(), index=index.normalize())
+    
+    def _calculate_valuation_metrics(self, table: StockTable) -> Dict:
+        """밸류에이션 지표 계산"""
         try:
-            positive = 0
-            negative = 0
-            neutral = 0
+            def _valid(values: np.ndarray) -> np.ndarray:
+                return values[np.isfinite(values) & (values > 0)]
             
-            for data in stocks_data.values():
-                change_1m = data.get('price_history', {}).get('1m_change', 0)
-                
-                if change_1m > 0.05:
-                    positive += 1
-                elif change_1m < -0.05:
-                    negative += 1
-                else:
-                    neutral += 1
+            pe_ratios = _valid(table.pe_ratio)
+            ps_ratios = _valid(table.ps_ratio)
+            pb_ratios = _valid(table.pb_ratio)
             
-            total = positive + negative + neutral
+            # P/S 기준 가장 비싼/싼 종목 (유효하지 않은 값은 argmax/argmin 대상에서 제외)
+            most_expensive = least_expensive = None
+            if ps_ratios.size:
+                ps = np.where(np.isfinite(table.ps_ratio) & (table.ps_ratio > 0), table.ps_ratio, np.nan)
+                most_expensive = table.tickers[int(np.nanargmax(ps))]
+                least_expensive = table.tickers[int(np.nanargmin(ps))]
             
             return {
-                'positive': positive,
-                'negative': negative,
-                'neutral': neutral,
-                'positive_ratio': positive / total if total > 0 else 0,
-                'sentiment': 'bullish' if positive > negative else 'bearish' if negative > positive else 'neutral'
+                'avg_pe': pe_ratios.mean() if pe_ratios.size else None,
+                'median_pe': np.median(pe_ratios) if pe_ratios.size else None,
+                'avg_ps': ps_ratios.mean() if ps_ratios.size else None,
+                'avg_pb': pb_ratios.mean() if pb_ratios.size else None,
+                'most_expensive_ps': most_expensive,
+                'least_expensive_ps': least_expensive,
+                'sample_size': len(table)
             }
         except Exception as e:
-            self.logger.error(f"시장 감성 분석 오류: {e}")
+            self.logger.error(f"밸류에이션 지표 계산 오류: {e}")
             return {}
     
+    def _identify_risks(self, table: StockTable) -> List[str]:
+        """고변동성 / RSI 과매수 종목 경고 (컬럼 마스크로 한 번에 선별, 값이 없는 종목은 제외)"""
+        risks = []
+        tickers = np.array(table.tickers, dtype=object)
+        
+        high_volatility = table.volatility_30d > _HIGH_VOLATILITY
+        if high_volatility.any():
+            risks.append(f"고변동성 (30일 변동성 {_HIGH_VOLATILITY:.0%} 초과): {', '.join(tickers[high_volatility])}")
+        
+        overbought = table.rsi > _OVERBOUGHT_RSI
+        if overbought.any():
+            risks.append(f"과매수 구간 (RSI {_OVERBOUGHT_RSI} 초과): {', '.join(tickers[overbought])}")
+        
+        return risks
+    
     async def _generate_investment_insights(self, stocks_data: Dict, 
+                                           table: StockTable,
                                            sector_analysis: Dict,
-                                           valuation_metrics: Dict) -> str:
-        """투자 인사이트 생성"""
+                                           valuation_metrics: Dict) -> Tuple[str, Dict]:
+        """투자 인사이트 생성 (전체 인사이트 + 종목별 투자 포인트/리스크를 한 번의 호출로)"""
         if not self.llm:
-            return "투자 인사이트 생성 불가 (LLM 미설정)"
+            return "투자 인사이트 생성 불가 (LLM 미설정)", {}
         
         try:
-            # 상위 5개 주식 요약
-            top_performers = sorted(
-                stocks_data.items(),
-                key=lambda x: x[1].get('price_history', {}).get('1y_change', 0),
-                reverse=True
-            )[:5]
+            # 상위 5개 주식 요약 (전체 정렬 대신 argpartition으로 상위 k개만 고른 뒤 k개만 정렬)
+            top_performers = [
+                (table.tickers[i], stocks_data[table.tickers[i]])
+                for i in self._top_k_indices(table.one_y_change, 5)
+            ]
             
             performers_text = "\n".join([
                 f"- {ticker} ({data['company']}): 1년 수익률 {data['price_history']['1y_change']*100:.1f}%, "
@@ -752,28 +1404,74 @@ JSON 형식으로만 응답:
                 for ticker, data in top_performers
             ])
             
+            # 전 종목을 한 줄씩 요약한 표 (종목별로 따로 호출하지 않도록 한 프롬프트에 포함)
+            table_text = "\n".join(
+                f"{ticker} | {self._format_ratio(data.get('price_history', {}).get('1y_change'))} | "
+                f"{self._format_ratio(data.get('price_history', {}).get('1m_change'))} | "
+                f"{data.get('financials', {}).get('pe_ratio', 'N/A')} | "
+                f"{data.get('technical_indicators', {}).get('rsi', 'N/A')} | "
+                f"{self._format_ratio(data.get('risk_metrics', {}).get('volatility_30d'))}"
+                for ticker, data in stocks_data.items()
+                if data
+            )
+            
             prompt = f"""전기차 관련 주식들의 분석 결과를 바탕으로 투자 인사이트를 제공하세요:
 
 **상위 수익률 종목:**
 {performers_text}
 
+**전체 종목 (티커 | 1년 수익률 | 1개월 수익률 | P/E | RSI | 30일 변동성):**
+{table_text}
+
 **밸류에이션:**
 - 평균 P/E: {valuation_metrics.get('avg_pe', 'N/A')}
 - 평균 P/S: {valuation_metrics.get('avg_ps', 'N/A')}
 
 **분석 종목 수:** {len(stocks_data)}개
 
-다음 내용을 포함하여 작성하세요:
+overview에는 다음 내용을 포함하여 작성하세요:
 1. 전반적인 섹터 전망 (3-4문장)
 2. 주목할 만한 종목과 그 이유 (3-4문장)
 3. 밸류에이션 관점에서의 평가 (2-3문장)
 4. 투자 시 주의사항 (2-3문장)
 
-한국어로 작성하세요."""
+tickers에는 전체 종목 각각에 대해 투자 포인트(thesis)와 리스크(risks)를 한 문장씩 작성하세요.
+
+한국어로 작성하고, 다음 JSON 형식으로만 응답하세요:
+{{"overview": "...", "tickers": {{"TICKER": {{"thesis": "...", "risks": "..."}}}}}}"""
             
-            response = await self.llm.ainvoke(prompt)
-            return response.content if hasattr(response, 'content') else str(response)
+            async with self._api_semaphore:
+                response = await self.llm.ainvoke(prompt, response_format={"type": "json_object"})
+            content = response.content if hasattr(response, 'content') else str(response)
+            
+            try:
+                parsed = json.loads(content)
+            except (TypeError, ValueError):
+                parsed = None
+            
+            if not isinstance(parsed, dict):
+                # JSON 파싱 실패 시 응답 원문을 인사이트로 사용
+                self.logger.warning("투자 인사이트 응답이 JSON 형식이 아닙니다. 원문을 사용합니다.")
+                return str(content), {}
+            
+            tickers = parsed.get('tickers')
+            return str(parsed.get('overview', '')), tickers if isinstance(tickers, dict) else {}
             
         except Exception as e:
             self.logger.error(f"투자 인사이트 생성 오류: {e}")
-            return "투자 인사이트 생성 중 오류 발생"
\ No newline at end of file
+            return "투자 인사이트 생성 중 오류 발생", {}
+    
+    @staticmethod
+    def _top_k_indices(values: np.ndarray, k: int) -> np.ndarray:
+        """값이 큰 순서대로 상위 k개 인덱스 (O(N) 선택 후 k개만 정렬)"""
+        k = min(k, values.size)
+        if k == 0:
+            return np.empty(0, dtype=np.intp)
+        
+        top = np.argpartition(-values, k - 1)[:k]
+        return top[np.argsort(-values[top], kind='stable')]
+    
+    @staticmethod
+    def _format_ratio(value) -> str:
+        """비율 값을 퍼센트 문자열로 (값이 없으면 N/A)"""
+        return f"{value * 100:.1f}%" if isinstance(value, (int, float)) else 'N/A'
@@ -2,7 +2,8 @@
 # agents/supervisor_agent.py
 
 from typing import Dict, Any, List, Optional
-from enum import Enum
+from enum import Enum, IntFlag, auto
+from dataclasses import dataclass
 import asyncio
 from datetime import datetime
 from .base_agent import BaseAgent
@@ -16,6 +17,49 @@ class WorkflowStage(Enum):
     REPORTING = "reporting"
     COMPLETED = "completed"
 
+class AgentId(IntFlag):
+    """Supervisor가 관리하는 Agent (상태 비트마스크용)"""
+    MARKET_RESEARCH = auto()
+    COMPANY_ANALYSIS = auto()
+    STOCK_ANALYSIS = auto()
+    CONSUMER_ANALYSIS = auto()
+    TECH_ANALYSIS = auto()
+    CHART_GENERATION = auto()
+    REPORT_GENERATION = auto()
+
+    @classmethod
+    def from_name(cls, agent_name: str) -> Optional['AgentId']:
+        """Agent 이름 → AgentId (알 수 없는 이름이면 None)"""
+        return cls.__members__.get(agent_name.upper())
+
+    @property
+    def agent_name(self) -> str:
+        return self.name.lower()
+
+@dataclass(slots=True)
+class SupervisorCheckpoint:
+    """반복마다 기록하는 Supervisor 상태 (JSONL 로그 / 단계 전환 스냅샷)"""
+    stage: str
+    iteration: int
+    agent_status: Dict[str, str]
+    timestamp: str
+
+# 완료로 간주하는 Agent 상태
+_DONE_STATUSES = frozenset({'completed', 'done'})
+
+# 분석 단계 완료 조건: Agent별 결과가 담기는 state 키
+_ANALYSIS_OUTPUTS = (
+    (AgentId.MARKET_RESEARCH, 'market_trends'),
+    (AgentId.CONSUMER_ANALYSIS, 'consumer_patterns'),
+    (AgentId.COMPANY_ANALYSIS, 'company_analysis'),
+    (AgentId.TECH_ANALYSIS, 'tech_trends'),
+    (AgentId.STOCK_ANALYSIS, 'stock_analysis')
+)
+REQUIRED_ANALYSIS_MASK = (
+    AgentId.MARKET_RESEARCH | AgentId.CONSUMER_ANALYSIS | AgentId.COMPANY_ANALYSIS
+    | AgentId.TECH_ANALYSIS | AgentId.STOCK_ANALYSIS
+)
+
 class SupervisorAgent(BaseAgent):
     """전체 워크플로우를 조정하는 Supervisor Agent"""
     
@@ -23,6 +67,10 @@ class SupervisorAgent(BaseAgent):
         super().__init__("supervisor", llm, config)
         self.current_stage = WorkflowStage.INITIALIZATION
         self.agent_status = {}
+        # 대기 중인 Agent 비트마스크 (상태 확인 시 문자열 비교 없이 비트 연산만 사용)
+        self._pending = AgentId(0)
+        # 완료된 Agent 비트마스크
+        self._done = AgentId(0)
         self.iteration_count = 0
         self.max_iterations = config.get('max_iterations', 10) if config else 10
         
@@ -38,6 +86,7 @@ class SupervisorAgent(BaseAgent):
             return state
         
         # 현재 워크플로우 단계에 따른 처리
+        previous_stage = self.current_stage
         if self.current_stage == WorkflowStage.INITIALIZATION:
             state = await self._initialize_workflow(state)
             
@@ -53,13 +102,17 @@ class SupervisorAgent(BaseAgent):
         elif self.current_stage == WorkflowStage.REPORTING:
             state = await self._coordinate_reporting(state)
             
-        # 상태 저장
-        self.save_output({
-            'stage': self.current_stage.value,
-            'iteration': self.iteration_count,
-            'agent_status': self.agent_status,
-            'timestamp': self.get_timestamp()
-        }, f'supervisor_state_{self.iteration_count}.json')
+        # 상태 기록: 매 반복은 JSONL 로그에 한 줄만 추가하고,
+        # 전체 상태 스냅샷은 단계가 바뀔 때만 저장
+        snapshot = SupervisorCheckpoint(
+            stage=self.current_stage.value,
+            iteration=self.iteration_count,
+            agent_status=dict(self.agent_status),  # 스레드에서 직렬화되는 동안 변경되지 않도록 복사
+            timestamp=self.get_timestamp()
+        )
+        await self.append_log(snapshot)
+        if self.current_stage != previous_stage:
+            await self.asave_output(snapshot, f'supervisor_state_{self.iteration_count}.json')
         
         return state
     
@@ -74,15 +127,16 @@ class SupervisorAgent(BaseAgent):
             'stock_analysis'
         ]
         
+        started_at = datetime.now()
         state['workflow_metadata'] = {
-            'started_at': self.get_timestamp(),
+            'started_at': started_at.isoformat(),
             'initiated_by': 'supervisor',
-            'workflow_id': f"wf_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            'workflow_id': f"wf_{started_at:%Y%m%d_%H%M%S}"
         }
         
         # Agent 상태 초기화
         for agent in state['required_agents']:
-            self.agent_status[agent] = 'pending'
+            self._set_status(agent, 'pending')
         
         self.current_stage = WorkflowStage.DATA_COLLECTION
         state['next_agents'] = ['market_research', 'company_analysis', 'stock_analysis']
@@ -94,10 +148,7 @@ class SupervisorAgent(BaseAgent):
         self.logger.info("데이터 수집 단계 조정 중...")
         
         # 병렬 실행할 Agent들 확인
-        pending_agents = [
-            agent for agent, status in self.agent_status.items() 
-            if status == 'pending'
-        ]
+        pending_agents = [agent.agent_name for agent in AgentId if self._pending & agent]
         
         if not pending_agents:
             # 모든 기본 데이터 수집 완료
@@ -105,8 +156,8 @@ class SupervisorAgent(BaseAgent):
             state['next_agents'] = ['consumer_analysis', 'tech_analysis']
             
             # 분석 Agent들 상태 추가
-            self.agent_status['consumer_analysis'] = 'pending'
-            self.agent_status['tech_analysis'] = 'pending'
+            self._set_status('consumer_analysis', 'pending')
+            self._set_status('tech_analysis', 'pending')
         else:
             # 아직 수집 중
             state['pending_agents'] = pending_agents
@@ -117,19 +168,16 @@ class SupervisorAgent(BaseAgent):
         """분석 단계 조정"""
         self.logger.info("분석 단계 조정 중...")
         
-        # 분석 완료 확인
-        analysis_complete = all([
-            state.get('market_trends'),
-            state.get('consumer_patterns'),
-            state.get('company_analysis'),
-            state.get('tech_trends'),
-            state.get('stock_analysis')
-        ])
+        # 분석 완료 확인: 아직 완료 비트가 없는 Agent만 결과를 확인한 뒤 마스크 비교 한 번으로 판정
+        for agent, output_key in _ANALYSIS_OUTPUTS:
+            if not self._done & agent and state.get(output_key):
+                self._done |= agent
+        analysis_complete = (self._done & REQUIRED_ANALYSIS_MASK) == REQUIRED_ANALYSIS_MASK
         
         if analysis_complete:
             self.current_stage = WorkflowStage.SYNTHESIS
             state['next_agents'] = ['chart_generation']
-            self.agent_status['chart_generation'] = 'pending'
+            self._set_status('chart_generation', 'pending')
         
         return state
     
@@ -140,7 +188,7 @@ class SupervisorAgent(BaseAgent):
         if state.get('charts_generated'):
             self.current_stage = WorkflowStage.REPORTING
             state['next_agents'] = ['report_generation']
-            self.agent_status['report_generation'] = 'pending'
+            self._set_status('report_generation', 'pending')
         
         return state
     
@@ -155,7 +203,7 @@ class SupervisorAgent(BaseAgent):
             
             # 최종 요약
             summary = self._create_workflow_summary(state)
-            self.save_output(summary, 'workflow_summary.json')
+            await self.asave_output(summary, 'workflow_summary.json')
             
             self.logger.info("워크플로우 완료!")
         
@@ -181,9 +229,24 @@ class SupervisorAgent(BaseAgent):
             }
         }
     
+    def _set_status(self, agent_name: str, status: str):
+        """Agent 상태 기록 + 대기 비트마스크 갱신"""
+        self.agent_status[agent_name] = status
+        agent = AgentId.from_name(agent_name)
+        if agent is None:
+            return
+        if status == 'pending':
+            self._pending |= agent
+        else:
+            self._pending &= ~agent
+        if status in _DONE_STATUSES:
+            self._done |= agent
+        else:
+            self._done &= ~agent
+    
     def update_agent_status(self, agent_name: str, status: str):
         """Agent 상태 업데이트"""
-        self.agent_status[agent_name] = status
+        self._set_status(agent_name, status)
         self.logger.info(f"Agent 상태 업데이트: {agent_name} -> {status}")
     
     def get_next_agents(self, state: Dict[str, Any]) -> List[str]:
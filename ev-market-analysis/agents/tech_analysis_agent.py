@@ -1,76 +1,368 @@
 # agents/tech_analysis_agent.py
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 import asyncio
+from dataclasses import dataclass
+import functools
+import hashlib
+import json
 import os
+import random
 from datetime import datetime
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from tavily import TavilyClient
 from .base_agent import BaseAgent
+from .file_cache import FileCache
+from .rate_limiter import TavilyLimiter, parse_retry_after
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+TAVILY_SEARCH_URL = 'https://api.tavily.com/search'
+
+# 모든 검색에 공통으로 쓰는 Tavily 옵션 (요약 답변/원문 없이 기본 깊이 검색 - 응답 크기와 지연 감소)
+_SEARCH_OPTIONS = {
+    'search_depth': 'basic',
+    'include_answer': False,
+    'include_raw_content': False
+}
+
+# 저장할 검색 결과 본문 길이 (리포트는 결과별 content 앞부분만 사용)
+_RESULT_CONTENT_CHARS = 500
+
+# Fallback 결과에 붙는 표식
+FALLBACK_NOTE = 'Fallback 데이터'
+
+# 동시 요청 한도를 줄이고 Retry-After 만큼 쉬어야 하는 응답 코드
+_THROTTLE_STATUSES = frozenset({429, 502, 503, 504})
+
+
+def _extract_json(text: str) -> Optional[str]:
+    """문자열에서 첫 번째 중괄호 균형 JSON 객체 부분 추출 (한 번의 선형 스캔, 문자열 안의 중괄호는 무시)"""
+    start = text.find('{')
+    if start < 0:
+        return None
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+
+def _parse_json_object(text: str) -> Optional[Dict]:
+    """LLM 응답을 JSON 객체로 파싱 (응답 전체가 JSON이면 바로, 아니면 본문에서 추출, 객체가 없으면 None)"""
+    try:
+        parsed = json.loads(text.strip())
+        if isinstance(parsed, dict):
+            return parsed
+    except ValueError:
+        pass
+    block = _extract_json(text)
+    return json.loads(block) if block is not None else None
+
+
+def _is_transient_error(error: Exception) -> bool:
+    """다시 시도하면 성공할 수 있는 오류인지 (제한/일시 장애 응답, 연결 오류, 타임아웃)"""
+    if AIOHTTP_AVAILABLE:
+        if isinstance(error, aiohttp.ClientResponseError):
+            return error.status in _THROTTLE_STATUSES
+        if isinstance(error, aiohttp.ClientConnectionError):
+            return True
+    return isinstance(error, (asyncio.TimeoutError, requests.ConnectionError, requests.Timeout))
+
+
+def with_fallback(fallback, retries: int = 3, max_backoff: float = 60.0):
+    """비동기 분석 메서드 데코레이터 - 일시적 오류는 지수 백오프로 재시도, 그 외 오류나 재시도 소진 시 Fallback
+
+    Args:
+        fallback: (self, *args, **kwargs)를 받아 대체 결과를 반환하는 함수
+        retries: 최대 시도 횟수
+        max_backoff: 재시도 대기 상한 (초)
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(self, *args, **kwargs):
+            # 분석 항목 정의가 인자로 오면 항목 라벨로 로그 표시
+            label = getattr(args[0], 'label', fn.__name__) if args else fn.__name__
+            for attempt in range(retries):
+                try:
+                    return await fn(self, *args, **kwargs)
+                except Exception as e:
+                    if attempt + 1 >= retries or not _is_transient_error(e):
+                        self.logger.error(f"{label} 오류: {e}")
+                        break
+                    delay = min(max_backoff, 2 ** attempt + random.random())
+                    self.logger.warning(f"{label} 일시적 오류, {delay:.1f}초 후 재시도 ({attempt + 1}/{retries}): {e}")
+                    await asyncio.sleep(delay)
+            return fallback(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# 기술 분석 항목별 Tavily 검색 쿼리 (고정값)
+BATTERY_QUERIES: Tuple[str, ...] = (
+    "electric vehicle battery technology trends 2025 lithium ion solid state",
+    "EV battery energy density improvement 2025",
+    "battery manufacturing cost reduction technology",
+    "next generation battery technology electric vehicles"
+)
+CHARGING_QUERIES: Tuple[str, ...] = (
+    "electric vehicle fast charging technology 2025 ultra rapid",
+    "wireless charging EV technology development",
+    "vehicle to grid V2G technology adoption",
+    "EV charging speed improvement battery health"
+)
+AUTONOMOUS_QUERIES: Tuple[str, ...] = (
+    "electric vehicle autonomous driving technology integration 2025",
+    "ADAS advanced driver assistance systems EV",
+    "self driving technology level 3 level 4 electric vehicles",
+    "AI software defined vehicle electric car"
+)
+SOFTWARE_QUERIES: Tuple[str, ...] = (
+    "electric vehicle software platform OTA updates 2025",
+    "software defined vehicle SDV architecture",
+    "EV operating system connectivity ecosystem"
+)
+MANUFACTURING_QUERIES: Tuple[str, ...] = (
+    "electric vehicle manufacturing innovation giga casting 2025",
+    "EV production efficiency automation robotics",
+    "electric vehicle platform architecture scalability",
+    "battery manufacturing vertical integration"
+)
+FUTURE_TECH_QUERIES: Tuple[str, ...] = (
+    "electric vehicle future technology 2030 breakthrough",
+    "hydrogen fuel cell electric vehicle development",
+    "graphene battery technology commercialization",
+    "AI powered battery management system"
+)
+
+
+# 검색 불가 / 실패 시 사용할 항목별 Fallback 데이터 (AnalyzerSpec.fallback 키)
+FALLBACK_TABLE: Dict[str, Dict[str, Any]] = {
+    'battery': {
+        'current_tech': '리튬이온 배터리 주류',
+        'energy_density': '250-300 Wh/kg',
+        'future_tech': '고체전지, 리튬-메탈',
+        'note': FALLBACK_NOTE
+    },
+    'charging': {
+        'fast_charging': '150-350kW 급속충전',
+        'wireless': '개발 중',
+        'v2g': '초기 시험 단계',
+        'note': FALLBACK_NOTE
+    },
+    'autonomous': {
+        'current_level': 'L2/L3',
+        'commercialization': 'L2 보편화, L3 확대 중',
+        'future': 'L4/L5 개발 중',
+        'note': FALLBACK_NOTE
+    },
+    'manufacturing': {
+        'key_innovation': '기가캐스팅, 자동화',
+        'efficiency': '생산 시간 단축',
+        'cost_reduction': '30-40%',
+        'note': FALLBACK_NOTE
+    },
+    'software': {
+        'ota_updates': '보편화',
+        'connectivity': '5G, V2X',
+        'ecosystem': '앱 스토어, 서비스 플랫폼',
+        'note': FALLBACK_NOTE
+    },
+    'future': {
+        # 튜플로 두어 얕은 복사만으로도 원본이 바뀌지 않도록 함
+        'breakthrough_tech': (
+            '고체전지 상용화',
+            '그래핀 배터리',
+            '수소 전기차',
+            'AI 배터리 관리'
+        ),
+        'timeline': '2027-2030',
+        'note': FALLBACK_NOTE
+    }
+}
+
+
+def get_fallback(key: str) -> Dict[str, Any]:
+    """항목별 Fallback 데이터 복사본 (호출 측이 수정해도 원본 테이블은 그대로)"""
+    return dict(FALLBACK_TABLE[key])
+
+
+@dataclass(frozen=True)
+class AnalyzerSpec:
+    """검색 기반 기술 분석 항목 정의"""
+    key: str                 # tech_trends 결과 키
+    label: str               # 로그 표시
+    queries: Tuple[str, ...]
+    result_field: str        # 검색 결과 목록을 담을 필드
+    fallback: str            # 검색 불가 / 실패 시 사용할 FALLBACK_TABLE 키
+    max_results: int = 2     # 쿼리당 검색 결과 수
 
 
 class TechAnalysisAgent(BaseAgent):
     """기술 분석 Agent - Tavily 웹 검색 활용"""
     
+    # 기술 분석 항목 (결과 키, 로그 라벨, 검색 쿼리, 검색 결과 필드, Fallback 키, 결과 수)
+    ANALYZER_SPECS = (
+        AnalyzerSpec(
+            key='battery_technology',
+            label='🔋 배터리 기술 분석',
+            queries=BATTERY_QUERIES,
+            result_field='battery_searches',
+            fallback='battery'
+        ),
+        AnalyzerSpec(
+            key='charging_technology',
+            label='⚡ 충전 기술 분석',
+            queries=CHARGING_QUERIES,
+            result_field='charging_searches',
+            fallback='charging'
+        ),
+        AnalyzerSpec(
+            key='autonomous_driving',
+            label='🤖 자율주행 기술 분석',
+            queries=AUTONOMOUS_QUERIES,
+            result_field='autonomous_searches',
+            fallback='autonomous'
+        ),
+        AnalyzerSpec(
+            key='software_platform',
+            label='💻 소프트웨어 플랫폼 분석',
+            queries=SOFTWARE_QUERIES,
+            result_field='software_searches',
+            fallback='software'
+        ),
+        AnalyzerSpec(
+            key='manufacturing_innovation',
+            label='🏭 제조 혁신 분석',
+            queries=MANUFACTURING_QUERIES,
+            result_field='manufacturing_searches',
+            fallback='manufacturing'
+        ),
+        AnalyzerSpec(
+            key='future_trends',
+            label='🔮 미래 기술 전망',
+            queries=FUTURE_TECH_QUERIES,
+            result_field='future_tech_searches',
+            fallback='future',
+            max_results=3  # 전망은 더 넓은 출처 참고
+        )
+    )
+    
     def __init__(self, llm=None, config: Optional[Dict] = None):
         super().__init__("tech_analysis", llm, config)
         
         # Tavily 클라이언트 초기화
         tavily_api_key = os.getenv('TAVILY_API_KEY')
+        self._tavily_api_key = tavily_api_key
         if tavily_api_key:
-            self.tavily_client = TavilyClient(api_key=tavily_api_key)
+            self.tavily_client = self._create_tavily_client(tavily_api_key)
             self.logger.info("Tavily 클라이언트 초기화 완료")
         else:
             self.tavily_client = None
             self.logger.warning("TAVILY_API_KEY가 설정되지 않았습니다. 검색 기능이 제한됩니다.")
+        
+        # Tavily 호출 제한 (모든 분석기가 공유: 동시 요청 수 + 분당 요청 수 슬라이딩 윈도우)
+        self._limiter = TavilyLimiter(
+            max_concurrent=self.config.get('tavily_max_concurrency', 4),
+            max_calls=self.config.get('tavily_rpm', 100),
+            period=60.0
+        )
+        
+        # 검색 결과 캐시 ((쿼리, 결과 수) 키, 메모리 + 디스크) - 쿼리가 고정이라 재실행 시 네트워크 호출 생략
+        self.use_cache = self.config.get('use_cache', True)
+        self._search_cache = FileCache(
+            self.config.get('cache_dir', '.cache/tavily'),
+            ttl=self.config.get('search_cache_ttl', 3600)  # 초
+        )
+        # 진행 중인 검색 (같은 쿼리를 동시에 요청하면 하나의 호출 결과를 함께 기다림)
+        self._inflight: Dict[str, asyncio.Task] = {}
+        
+        # aiohttp가 있으면 스레드 풀 없이 이벤트 루프에서 직접 HTTP 호출 (세션은 process 실행마다 생성/종료)
+        self.use_aiohttp = AIOHTTP_AVAILABLE and self.config.get('use_aiohttp', True)
+        self._http_session = None
+        
+        # LLM 결과 캐시 (프롬프트 MD5 → 결과) - 입력이 같으면 같은 실행 안에서 LLM 재호출 생략
+        self._llm_cache: Dict[str, Any] = {}
+    
+    def _create_tavily_client(self, api_key: str) -> TavilyClient:
+        """연결 풀과 재시도가 설정된 requests 세션을 쓰는 Tavily 클라이언트 생성"""
+        pool_size = self.config.get('tavily_max_concurrency', 4)
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=(429, 502, 503, 504),
+                allowed_methods=frozenset({'POST'}),  # Tavily 검색은 POST
+                respect_retry_after_header=True
+            )
+        )
+        session = requests.Session()
+        session.mount('https://', adapter)
+        
+        try:
+            return TavilyClient(api_key=api_key, session=session)
+        except TypeError:
+            # session 인자를 지원하지 않는 이전 버전 tavily-python
+            session.close()
+            return TavilyClient(api_key=api_key)
     
     async def process(self, state: Dict[str, Any]) -> Dict[str, Any]:
-        """기술 분석 메인 프로세스 - Rate Limiting 강화"""
+        """기술 분석 메인 프로세스 (분석기 병렬 실행, 첫 실제 검색 결과가 오면 LLM 평가를 나머지 검색과 겹쳐 실행)"""
         self.logger.info("기술 분석 시작...")
         
+        insights_task = None
         try:
-            # ⭐ Rate Limiting 설정
-            self.request_delay = 3.0  # API 호출 간 3초 대기 (기존 2초에서 증가)
-            self.max_retries = 3
-            
-            # ⭐ 순차적으로 실행 (병렬 실행 금지)
-            # 각 분석 사이에 충분한 대기 시간 확보
-            
-            self.logger.info("1/6: 배터리 기술 분석 중...")
-            battery_tech = await self._analyze_battery_technology()
-            await asyncio.sleep(3)  # 추가 대기
+            # 모든 항목이 같은 분석 시각을 공유
+            analysis_ts = self.get_timestamp()
             
-            self.logger.info("2/6: 충전 기술 분석 중...")
-            charging_tech = await self._analyze_charging_technology()
-            await asyncio.sleep(3)  # 추가 대기
+            async def run(spec: AnalyzerSpec):
+                return spec, await self._run_analyzer(spec, analysis_ts)
             
-            self.logger.info("3/6: 자율주행 기술 분석 중...")
-            autonomous = await self._analyze_autonomous_technology()
-            await asyncio.sleep(3)  # 추가 대기
+            # 분석 항목들은 서로 독립적인 I/O라 동시에 실행, 끝나는 순서대로 수집
+            results: Dict[str, Dict] = {}
+            for next_done in asyncio.as_completed([run(spec) for spec in self.ANALYZER_SPECS]):
+                spec, result = await next_done
+                results[spec.key] = result
+                # 성숙도 평가는 검색 결과 요약만 필요하므로, 실제 검색 결과가 하나라도 오면 바로 시작
+                if insights_task is None and result.get('note') != FALLBACK_NOTE:
+                    insights_task = asyncio.create_task(self._generate_llm_insights(dict(results)))
             
-            self.logger.info("4/6: 소프트웨어 플랫폼 분석 중...")
-            software = await self._analyze_software_platform()
-            await asyncio.sleep(3)  # 추가 대기
-            
-            self.logger.info("5/6: 제조 혁신 분석 중...")
-            manufacturing = await self._analyze_manufacturing_innovation()
-            await asyncio.sleep(3)  # 추가 대기
-            
-            self.logger.info("6/6: 미래 기술 전망 분석 중...")
-            future_trends = await self._analyze_future_technologies()
+            # 모두 Fallback이면 여기서 실행 (성숙도는 LLM 없이 기본값)
+            insights = await insights_task if insights_task is not None else await self._generate_llm_insights(results)
             
             # 결과 통합
             tech_trends = {
-                'battery_technology': battery_tech,
-                'charging_technology': charging_tech,
-                'autonomous_driving': autonomous,
-                'software_platform': software,
-                'manufacturing_innovation': manufacturing,
-                'future_trends': future_trends,
-                'analysis_timestamp': self.get_timestamp()
+                **{spec.key: results[spec.key] for spec in self.ANALYZER_SPECS},
+                **insights,
+                'analysis_timestamp': analysis_ts
             }
             
             # 결과 저장
-            self.save_output(tech_trends, 'tech_analysis.json')
+            await self.asave_output(tech_trends, 'tech_analysis.json')
             
             # 상태 업데이트
             state['tech_trends'] = tech_trends
@@ -82,223 +374,144 @@ class TechAnalysisAgent(BaseAgent):
             import traceback
             traceback.print_exc()
             state['tech_analysis_error'] = str(e)
+        finally:
+            if insights_task is not None and not insights_task.done():
+                insights_task.cancel()
+            await self.aclose()
         
         return state
     
-    async def _analyze_battery_technology(self) -> Dict:
-        """배터리 기술 분석"""
-        self.logger.info("  🔋 배터리 기술 분석 중...")
-        
-        if not self.tavily_client:
-            return self._get_fallback_battery_tech()
-        
-        try:
-            queries = [
-                "electric vehicle battery technology trends 2025 lithium ion solid state",
-                "EV battery energy density improvement 2025",
-                "battery manufacturing cost reduction technology",
-                "next generation battery technology electric vehicles"
-            ]
-            
-            results = []
-            for query in queries:
-                search_results = await asyncio.to_thread(
-                    self.tavily_client.search,
-                    query=query,
-                    max_results=3
-                )
-                results.append({
-                    'query': query,
-                    'results': search_results.get('results', [])
-                })
-            
-            return {
-                'battery_searches': results,
-                'analysis_date': datetime.now().isoformat()
-            }
-            
-        except Exception as e:
-            self.logger.error(f"배터리 기술 분석 오류: {e}")
-            return self._get_fallback_battery_tech()
+    async def _generate_llm_insights(self, tech_data: Dict) -> Dict:
+        """성숙도 평가 후 로드맵과 종합 분석을 동시에 생성 (둘 다 성숙도만 사용)"""
+        maturity = await self._assess_technology_maturity(tech_data)
+        staged = {**tech_data, 'maturity_assessment': maturity}
+        roadmap, synthesis = await asyncio.gather(
+            self._create_technology_roadmap(staged),
+            self._synthesize_tech_insights(staged)
+        )
+        return {
+            'maturity_assessment': maturity,
+            'roadmap': roadmap,
+            'synthesis': synthesis
+        }
     
-    async def _analyze_charging_technology(self) -> Dict:
-        """충전 기술 분석"""
-        self.logger.info("  ⚡ 충전 기술 분석 중...")
-        
-        if not self.tavily_client:
-            return self._get_fallback_charging_tech()
-        
-        try:
-            queries = [
-                "electric vehicle fast charging technology 2025 ultra rapid",
-                "wireless charging EV technology development",
-                "vehicle to grid V2G technology adoption",
-                "EV charging speed improvement battery health"
-            ]
-            
-            results = []
-            for query in queries:
-                search_results = await asyncio.to_thread(
-                    self.tavily_client.search,
-                    query=query,
-                    max_results=3
-                )
-                results.append({
-                    'query': query,
-                    'results': search_results.get('results', [])
-                })
-            
-            return {
-                'charging_searches': results,
-                'analysis_date': datetime.now().isoformat()
-            }
-            
-        except Exception as e:
-            self.logger.error(f"충전 기술 분석 오류: {e}")
-            return self._get_fallback_charging_tech()
+    async def aclose(self):
+        """aiohttp 세션 종료"""
+        if self._http_session is not None and not self._http_session.closed:
+            await self._http_session.close()
+        self._http_session = None
     
-    async def _analyze_autonomous_technology(self) -> Dict:
-        """자율주행 기술 분석"""
-        self.logger.info("  🤖 자율주행 기술 분석 중...")
-        
-        if not self.tavily_client:
-            return self._get_fallback_autonomous_tech()
-        
-        try:
-            queries = [
-                "electric vehicle autonomous driving technology integration 2025",
-                "ADAS advanced driver assistance systems EV",
-                "self driving technology level 3 level 4 electric vehicles",
-                "AI software defined vehicle electric car"
-            ]
-            
-            results = []
-            for query in queries:
-                search_results = await asyncio.to_thread(
-                    self.tavily_client.search,
-                    query=query,
-                    max_results=3
+    def _get_http_session(self):
+        """현재 이벤트 루프에서 재사용할 aiohttp 세션 (없으면 생성)"""
+        if self._http_session is None or self._http_session.closed:
+            self._http_session = aiohttp.ClientSession(
+                headers={'Authorization': f'Bearer {self._tavily_api_key}'},
+                connector=aiohttp.TCPConnector(limit=self._limiter.max_concurrent),
+                timeout=aiohttp.ClientTimeout(total=self.config.get('tavily_timeout', 15))
+            )
+        return self._http_session
+    
+    async def _tavily_search_async(self, **payload) -> Dict:
+        """Tavily 검색 REST API 직접 호출 (aiohttp, 응답에 따라 공유 제한기의 동시 요청 한도 조절)"""
+        session = self._get_http_session()
+        async with session.post(TAVILY_SEARCH_URL, json=payload) as response:
+            if response.status in _THROTTLE_STATUSES:
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                await self._limiter.record_throttle(retry_after)
+                self.logger.warning(
+                    f"Tavily 제한 응답 ({response.status}) - {retry_after:.1f}초 대기, "
+                    f"동시 요청 한도 {self._limiter.concurrency:.1f}"
                 )
-                results.append({
-                    'query': query,
-                    'results': search_results.get('results', [])
-                })
-            
-            return {
-                'autonomous_searches': results,
-                'analysis_date': datetime.now().isoformat()
-            }
-            
-        except Exception as e:
-            self.logger.error(f"자율주행 기술 분석 오류: {e}")
-            return self._get_fallback_autonomous_tech()
+            elif response.status < 400:
+                if self._rate_limit_exhausted(response.headers):
+                    # 남은 호출 수가 0이면 제한 응답을 받기 전에 미리 속도를 낮춤
+                    await self._limiter.record_throttle(parse_retry_after(response.headers.get('Retry-After')))
+                else:
+                    await self._limiter.record_success()
+            response.raise_for_status()
+            return await response.json()
     
-    async def _analyze_manufacturing_innovation(self) -> Dict:
-        """제조 혁신 분석"""
-        self.logger.info("  🏭 제조 혁신 분석 중...")
-        
-        if not self.tavily_client:
-            return self._get_fallback_manufacturing_tech()
-        
+    @staticmethod
+    def _rate_limit_exhausted(headers) -> bool:
+        """x-ratelimit-remaining 헤더가 있고 0 이하인지 확인"""
+        remaining = headers.get('x-ratelimit-remaining')
         try:
-            queries = [
-                "electric vehicle manufacturing innovation giga casting 2025",
-                "EV production efficiency automation robotics",
-                "electric vehicle platform architecture scalability",
-                "battery manufacturing vertical integration"
-            ]
-            
-            results = []
-            for query in queries:
-                search_results = await asyncio.to_thread(
-                    self.tavily_client.search,
-                    query=query,
-                    max_results=3
-                )
-                results.append({
-                    'query': query,
-                    'results': search_results.get('results', [])
-                })
-            
-            return {
-                'manufacturing_searches': results,
-                'analysis_date': datetime.now().isoformat()
-            }
-            
-        except Exception as e:
-            self.logger.error(f"제조 혁신 분석 오류: {e}")
-            return self._get_fallback_manufacturing_tech()
+            return remaining is not None and int(remaining) <= 0
+        except ValueError:
+            return False
     
-    async def _analyze_software_platform(self) -> Dict:
-        """소프트웨어 플랫폼 분석"""
-        self.logger.info("  💻 소프트웨어 플랫폼 분석 중...")
+    async def _search(self, **kwargs) -> Dict:
+        """Tavily 검색 (공유 제한기 안에서 실행, aiohttp 미설치 시 클라이언트를 스레드에서 호출)"""
+        async with self._limiter:
+            if self.use_aiohttp:
+                return await self._tavily_search_async(**kwargs)
+            return await asyncio.to_thread(self.tavily_client.search, **kwargs)
+    
+    async def _cached_search(self, query: str, max_results: int) -> Dict:
+        """캐시를 거치는 Tavily 검색 (같은 쿼리의 동시 요청은 네트워크 호출 1회로 합침)"""
+        key = FileCache.key('search', query, max_results)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._search_with_cache(key, query, max_results))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # 먼저 요청한 쪽이 취소돼도 다른 대기자를 위해 검색은 계속 진행
+        return await asyncio.shield(task)
+    
+    async def _search_with_cache(self, key: str, query: str, max_results: int) -> Dict:
+        """캐시 조회 후 없으면 Tavily 검색 (성공한 결과만 캐시)"""
+        if self.use_cache:
+            cached = await self._search_cache.get(key)
+            if cached is not None:
+                return cached
         
-        if not self.tavily_client:
-            return self._get_fallback_software_platform()
+        response = await self._search(query=query, max_results=max_results, **_SEARCH_OPTIONS)
+        # 이후 단계에서 쓰는 필드만 남겨 캐시/결과 파일 크기를 줄임
+        search_results = {'results': [self._project_result(r) for r in response.get('results', [])]}
         
-        try:
-            queries = [
-                "electric vehicle software platform OTA updates 2025",
-                "software defined vehicle SDV architecture",
-                "EV operating system connectivity ecosystem"
-            ]
-            
-            results = []
-            for query in queries:
-                search_results = await asyncio.to_thread(
-                    self.tavily_client.search,
-                    query=query,
-                    max_results=3
-                )
-                results.append({
-                    'query': query,
-                    'results': search_results.get('results', [])
-                })
-            
-            return {
-                'software_searches': results,
-                'analysis_date': datetime.now().isoformat()
-            }
-            
-        except Exception as e:
-            self.logger.error(f"소프트웨어 플랫폼 분석 오류: {e}")
-            return self._get_fallback_software_platform()
+        if self.use_cache:
+            try:
+                await self._search_cache.set(key, search_results)
+            except Exception as e:
+                self.logger.warning(f"검색 캐시 저장 실패 ({query}): {e}")
+        return search_results
     
-    async def _analyze_future_technologies(self) -> Dict:
-        """미래 기술 전망"""
-        self.logger.info("  🔮 미래 기술 전망 중...")
+    @staticmethod
+    def _project_result(result: Dict) -> Dict:
+        """검색 결과 항목에서 제목, URL, 본문 앞부분만 추출"""
+        return {
+            'title': result.get('title', ''),
+            'url': result.get('url', ''),
+            'content': (result.get('content') or '')[:_RESULT_CONTENT_CHARS]
+        }
+    
+    @with_fallback(lambda self, spec, *_: get_fallback(spec.fallback))
+    async def _run_analyzer(self, spec: AnalyzerSpec, analysis_ts: str) -> Dict:
+        """검색 기반 기술 분석 (항목 정의에 따라 쿼리 실행, 일시적 오류는 재시도, 실패 시 Fallback)"""
+        self.logger.info(f"  {spec.label} 중...")
         
         if not self.tavily_client:
-            return self._get_fallback_future_tech()
+            return get_fallback(spec.fallback)
         
-        try:
-            queries = [
-                "electric vehicle future technology 2030 breakthrough",
-                "hydrogen fuel cell electric vehicle development",
-                "graphene battery technology commercialization",
-                "AI powered battery management system"
-            ]
-            
-            results = []
-            for query in queries:
-                search_results = await asyncio.to_thread(
-                    self.tavily_client.search,
-                    query=query,
-                    max_results=3
-                )
-                results.append({
-                    'query': query,
-                    'results': search_results.get('results', [])
-                })
-            
-            return {
-                'future_tech_searches': results,
-                'analysis_date': datetime.now().isoformat()
+        # 쿼리별 검색을 동시에 요청 (속도 제한은 공유 제한기가 담당, 재시도 시 이미 캐시된 쿼리는 다시 호출하지 않음)
+        search_results_list = await asyncio.gather(*[self._cached_search(query, spec.max_results) for query in spec.queries])
+        results = [
+            {
+                'query': query,
+                'results': search_results.get('results', [])
             }
-            
-        except Exception as e:
-            self.logger.error(f"미래 기술 전망 오류: {e}")
-            return self._get_fallback_future_tech()
+            for query, search_results in zip(spec.queries, search_results_list)
+        ]
+        
+        return {
+            spec.result_field: results,
+            'analysis_date': analysis_ts
+        }
+    
+    @staticmethod
+    def _llm_cache_key(kind: str, prompt: str) -> str:
+        """LLM 결과 캐시 키 (용도 + 프롬프트 전체의 MD5)"""
+        return hashlib.md5(f"{kind}:{prompt}".encode('utf-8')).hexdigest()
     
     async def _assess_technology_maturity(self, tech_data: Dict) -> Dict:
         """기술 성숙도 평가"""
@@ -307,6 +520,11 @@ class TechAnalysisAgent(BaseAgent):
         if not self.llm:
             return self._get_default_maturity()
         
+        # 검색 결과가 모두 Fallback이면 LLM에 줄 새 정보가 없으므로 기본값 사용
+        if all(v.get('note') == FALLBACK_NOTE for v in tech_data.values() if isinstance(v, dict)):
+            self.logger.info("  검색 결과가 모두 Fallback 데이터 - 기본 성숙도 사용")
+            return self._get_default_maturity()
+        
         try:
             prompt = """전기차 주요 기술들의 성숙도를 평가하세요.
 
@@ -335,17 +553,19 @@ JSON 형식:
 
 JSON만 출력하세요."""
             
-            response = await self.llm.ainvoke(prompt)
+            cache_key = self._llm_cache_key('maturity', prompt)
+            if cache_key in self._llm_cache:
+                return self._llm_cache[cache_key]
+            
+            # 같은 입력에 같은 결과가 나오도록 temperature 고정
+            response = await self.llm.ainvoke(prompt, temperature=0)
             content = response.content if hasattr(response, 'content') else str(response)
             
             # JSON 파싱
-            import json
-            import re
-            
-            json_match = re.search(r'\{.*\}', content, re.DOTALL)
-            if json_match:
-                maturity = json.loads(json_match.group())
+            maturity = _parse_json_object(content)
+            if maturity is not None:
                 self.logger.info(f"기술 성숙도 평가 완료")
+                self._llm_cache[cache_key] = maturity
                 return maturity
             else:
                 return self._get_default_maturity()
@@ -400,13 +620,19 @@ JSON만 출력하세요."""
 
 각 항목은 1-2문장으로 간결하게 작성하세요."""
             
-            response = await self.llm.ainvoke(prompt)
+            cache_key = self._llm_cache_key('roadmap', prompt)
+            if cache_key in self._llm_cache:
+                return self._llm_cache[cache_key]
+            
+            response = await self.llm.ainvoke(prompt, temperature=0)
             content = response.content if hasattr(response, 'content') else str(response)
             
-            return {
+            roadmap = {
                 'roadmap_text': content,
                 'generated_at': datetime.now().isoformat()
             }
+            self._llm_cache[cache_key] = roadmap
+            return roadmap
             
         except Exception as e:
             self.logger.error(f"로드맵 생성 오류: {e}")
@@ -454,62 +680,15 @@ JSON만 출력하세요."""
 4. 투자 기회 (2-3문장)
 """
             
-            response = await self.llm.ainvoke(prompt)
-            return response.content if hasattr(response, 'content') else str(response)
+            cache_key = self._llm_cache_key('synthesis', prompt)
+            if cache_key in self._llm_cache:
+                return self._llm_cache[cache_key]
+            
+            response = await self.llm.ainvoke(prompt, temperature=0)
+            synthesis = response.content if hasattr(response, 'content') else str(response)
+            self._llm_cache[cache_key] = synthesis
+            return synthesis
             
         except Exception as e:
             self.logger.error(f"종합 분석 오류: {e}")
             return "종합 분석 중 오류 발생"
-    
-    # Fallback 데이터
-    def _get_fallback_battery_tech(self) -> Dict:
-        return {
-            'current_tech': '리튬이온 배터리 주류',
-            'energy_density': '250-300 Wh/kg',
-            'future_tech': '고체전지, 리튬-메탈',
-            'note': 'Fallback 데이터'
-        }
-    
-    def _get_fallback_charging_tech(self) -> Dict:
-        return {
-            'fast_charging': '150-350kW 급속충전',
-            'wireless': '개발 중',
-            'v2g': '초기 시험 단계',
-            'note': 'Fallback 데이터'
-        }
-    
-    def _get_fallback_autonomous_tech(self) -> Dict:
-        return {
-            'current_level': 'L2/L3',
-            'commercialization': 'L2 보편화, L3 확대 중',
-            'future': 'L4/L5 개발 중',
-            'note': 'Fallback 데이터'
-        }
-    
-    def _get_fallback_manufacturing_tech(self) -> Dict:
-        return {
-            'key_innovation': '기가캐스팅, 자동화',
-            'efficiency': '생산 시간 단축',
-            'cost_reduction': '30-40%',
-            'note': 'Fallback 데이터'
-        }
-    
-    def _get_fallback_software_platform(self) -> Dict:
-        return {
-            'ota_updates': '보편화',
-            'connectivity': '5G, V2X',
-            'ecosystem': '앱 스토어, 서비스 플랫폼',
-            'note': 'Fallback 데이터'
-        }
-    
-    def _get_fallback_future_tech(self) -> Dict:
-        return {
-            'breakthrough_tech': [
-                '고체전지 상용화',
-                '그래핀 배터리',
-                '수소 전기차',
-                'AI 배터리 관리'
-            ],
-            'timeline': '2027-2030',
-            'note': 'Fallback 데이터'
-        }
\ No newline at end of file
@@ -4,39 +4,351 @@ Chart Generation Agent의 차트를 실제 이미지 파일로 저장하고
 보고서에 삽입하는 통합 모듈
 """
 
-from typing import Dict, Any, List, Optional
-import matplotlib.pyplot as plt
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from dataclasses import dataclass, replace
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import functools
+import gc
+import os
+import queue
+import threading
 import matplotlib
 matplotlib.use('Agg')  # GUI 없이 백그라운드에서 실행
+from matplotlib.figure import Figure
+from matplotlib.transforms import ScaledTranslation
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import seaborn as sns
+from PIL import Image
 from pathlib import Path
+import io
 import json
 from datetime import datetime
 import pandas as pd
 import numpy as np
 
+try:
+    import pyspng
+    PYSPNG_AVAILABLE = True
+except ImportError:
+    PYSPNG_AVAILABLE = False
+
 # Seaborn 스타일 설정
 sns.set_style("darkgrid")
 sns.set_palette("husl")
 
 
+# 스레드(워커 프로세스)마다 하나의 Figure를 만들어 두고 차트마다 비워서 재사용
+_figure_state = threading.local()
+
+
+def _reset_figure(figsize: Tuple[float, float]):
+    """재사용 Figure를 비우고 크기를 맞춘 뒤 (Figure, Axes) 반환 (pyplot 전역 상태에 등록하지 않음)"""
+    fig = getattr(_figure_state, 'figure', None)
+    if fig is None:
+        # constrained layout은 저장 시 그리기 과정에서 여백을 한 번만 계산 (tight_layout 호출 불필요)
+        fig = Figure(layout='constrained')
+        FigureCanvasAgg(fig)
+        _figure_state.figure = fig
+    fig.clear()
+    fig.set_size_inches(*figsize)
+    return fig, fig.add_subplot(111)
+
+
+def _release_figure():
+    """재사용 Figure에 남은 마지막 차트의 Artist/데이터를 비우고 순환 참조 수거"""
+    fig = getattr(_figure_state, 'figure', None)
+    if fig is not None:
+        fig.clear()
+    gc.collect()
+
+
+@functools.lru_cache(maxsize=32)
+def _palette(n: int) -> tuple:
+    """HUSL 팔레트를 색상 수별로 캐시 (lru_cache에 담을 수 있도록 RGB 튜플의 튜플)"""
+    return tuple(sns.color_palette('husl', n))
+
+
+def _as_array(values):
+    """수치 시리즈를 float64 배열로 한 번만 변환 (범주형 라벨은 리스트 그대로 사용)
+
+    숫자로 바꿀 수 없는 값('n/a' 등)이 섞여 있으면 원래 값을 그대로 돌려줘
+    matplotlib이 이전처럼 범주형으로 그리도록 함
+    """
+    try:
+        return np.asarray(values, dtype=np.float64)
+    except (ValueError, TypeError):
+        return values
+
+
+# IO 스레드 종료 신호 (큐에 넣으면 앞선 쓰기를 모두 마친 뒤 스레드가 끝남)
+_IO_STOP = None
+
+
+# 이 개수보다 점이 많은 라인은 SVG에서도 래스터로 저장 (벡터 마커 수천 개는 파일이 커지고 느림)
+_RASTERIZE_LINE_POINTS = 500
+
+
+@dataclass(frozen=True)
+class RenderOptions:
+    """차트 이미지 저장 옵션 (워커 프로세스로 전달)"""
+    output_dir: Path
+    dpi: int = 150                 # 보고서 화면 표시용 해상도
+    png_compress_level: int = 1    # zlib 압축 수준 (0-9, 낮을수록 인코딩이 빠르고 파일이 약간 큼)
+    output_format: str = 'png'     # 'png' 또는 'svg' (svg는 텍스트/축은 벡터, 점이 많은 요소만 래스터)
+    timestamp: Optional[str] = None  # 배치 공통 파일명 시각 (없으면 저장 시각)
+    sequence: Optional[int] = None   # 배치 안 순번 (같은 id 차트가 여러 개여도 파일명이 겹치지 않도록)
+
+
+def _encode_png(fig: Figure, options: RenderOptions) -> bytes:
+    """Figure를 한 번 그려 RGB 래스터를 PNG로 인코딩 (pyspng가 있으면 사용, 없으면 Pillow)"""
+    fig.set_dpi(options.dpi)
+    fig.set_facecolor('white')
+    fig.canvas.draw()
+    # 배경이 불투명한 흰색이라 알파 채널은 버림 (인코딩할 데이터 25% 감소)
+    rgb = np.ascontiguousarray(np.asarray(fig.canvas.buffer_rgba())[..., :3])
+    if PYSPNG_AVAILABLE:
+        return pyspng.encode(rgb, compress_level=options.png_compress_level)
+    buffer = io.BytesIO()
+    Image.fromarray(rgb).save(buffer, format='png', compress_level=options.png_compress_level)
+    return buffer.getvalue()
+
+
+def _save_figure(fig: Figure, chart_data: Dict, options: RenderOptions) -> Tuple[str, bytes]:
+    """Figure를 지정 형식(PNG/SVG)으로 인코딩해 (파일 경로, 파일 내용) 반환 (파일 쓰기는 호출 측 IO 스레드가 담당)"""
+    timestamp = options.timestamp or datetime.now().strftime('%Y%m%d_%H%M%S')
+    suffix = f"_{options.sequence:02d}" if options.sequence is not None else ""
+    filename = f"{chart_data.get('id', 'chart')}_{timestamp}{suffix}.{options.output_format}"
+    filepath = options.output_dir / filename
+    if options.output_format == 'svg':
+        # 래스터로 지정한 요소만 dpi 해상도로 그리고 나머지는 벡터로 저장
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='svg', dpi=options.dpi, facecolor='white')
+        return str(filepath), buffer.getvalue()
+    return str(filepath), _encode_png(fig, options)
+
+
+# 차트 렌더링 함수 (프로세스 풀에서 실행할 수 있도록 모듈 수준에 정의)
+
+def _create_line_chart(chart_data: Dict, options: RenderOptions) -> Tuple[str, bytes]:
+    """라인 차트 생성"""
+    fig, ax = _reset_figure((12, 6))
+    
+    data = chart_data.get('data', {})
+    x = data.get('x', [])  # 연도 등 범주형 라벨일 수 있어 변환하지 않음
+    y = _as_array(data.get('y', []))
+    
+    line, = ax.plot(x, y, marker='o', linewidth=2, markersize=8)
+    if len(x) > _RASTERIZE_LINE_POINTS:
+        line.set_rasterized(True)
+    
+    ax.set_title(chart_data.get('title', ''), fontsize=16, fontweight='bold', pad=20)
+    
+    layout = chart_data.get('layout', {})
+    if 'xaxis' in layout:
+        ax.set_xlabel(layout['xaxis'].get('title', ''), fontsize=12)
+    if 'yaxis' in layout:
+        ax.set_ylabel(layout['yaxis'].get('title', ''), fontsize=12)
+    
+    ax.grid(True, alpha=0.3)
+    return _save_figure(fig, chart_data, options)
+
+
+def _create_bar_chart(chart_data: Dict, options: RenderOptions) -> Tuple[str, bytes]:
+    """막대 차트 생성"""
+    fig, ax = _reset_figure((12, 6))
+    
+    data = chart_data.get('data', {})
+    x = data.get('x', [])
+    
+    # 다중 시리즈 처리
+    series = data.get('series', [])
+    if 'y_ytd' in data and 'y_1y' in data:
+        # 주가 성과 차트 (YTD, 1Y)
+        x_pos = np.arange(len(x))
+        width = 0.35
+        
+        ax.bar(x_pos - width/2, _as_array(data['y_ytd']), width, label='YTD Return (%)', alpha=0.8)
+        ax.bar(x_pos + width/2, _as_array(data['y_1y']), width, label='1Y Return (%)', alpha=0.8)
+        
+        ax.set_xticks(x_pos)
+        ax.set_xticklabels(x, rotation=45, ha='right')
+        ax.legend()
+    else:
+        # 일반 막대 차트
+        y = _as_array(data.get('y', []))
+        ax.bar(x, y, alpha=0.8)
+        ax.set_xticklabels(x, rotation=45, ha='right')
+    
+    ax.set_title(chart_data.get('title', ''), fontsize=16, fontweight='bold', pad=20)
+    
+    layout = chart_data.get('layout', {})
+    if 'xaxis' in layout:
+        ax.set_xlabel(layout['xaxis'].get('title', ''), fontsize=12)
+    if 'yaxis' in layout:
+        ax.set_ylabel(layout['yaxis'].get('title', ''), fontsize=12)
+    
+    ax.grid(True, alpha=0.3, axis='y')
+    return _save_figure(fig, chart_data, options)
+
+
+def _create_pie_chart(chart_data: Dict, options: RenderOptions) -> Tuple[str, bytes]:
+    """파이 차트 생성"""
+    fig, ax = _reset_figure((10, 8))
+    
+    data = chart_data.get('data', {})
+    labels = data.get('labels', [])
+    values = data.get('values', [])
+    
+    # 색상 팔레트
+    colors = _palette(len(labels))
+    
+    wedges, texts, autotexts = ax.pie(
+        values,
+        labels=labels,
+        autopct='%1.1f%%',
+        startangle=90,
+        colors=colors,
+        textprops={'fontsize': 10}
+    )
+    
+    # 퍼센트 텍스트 굵게
+    for autotext in autotexts:
+        autotext.set_color('white')
+        autotext.set_fontweight('bold')
+    
+    ax.set_title(chart_data.get('title', ''), fontsize=16, fontweight='bold', pad=20)
+    
+    return _save_figure(fig, chart_data, options)
+
+
+def _create_scatter_chart(chart_data: Dict, options: RenderOptions) -> Tuple[str, bytes]:
+    """산점도/버블 차트 생성"""
+    fig, ax = _reset_figure((12, 8))
+    
+    data = chart_data.get('data', {})
+    x = _as_array(data.get('x', []))
+    y = _as_array(data.get('y', []))
+    size = _as_array(data.get('size', [50] * len(x)))  # 기본 크기
+    labels = data.get('labels', [])
+    
+    # 버블 차트
+    scatter = ax.scatter(x, y, s=size, alpha=0.6, edgecolors='black', linewidth=1.5)
+    scatter.set_rasterized(True)  # SVG 저장 시 점들만 래스터 (PNG에는 영향 없음)
+    
+    # 라벨 추가 (보이는 영역 안의 점만, 점에서 오른쪽 위로 5pt 떨어진 위치)
+    if labels:
+        count = min(len(labels), len(x))
+        xs, ys = x[:count], y[:count]
+        if isinstance(xs, np.ndarray) and isinstance(ys, np.ndarray):
+            (x_min, x_max), (y_min, y_max) = ax.get_xlim(), ax.get_ylim()
+            visible = (xs >= x_min) & (xs <= x_max) & (ys >= y_min) & (ys <= y_max)
+        else:
+            # 범주형 축(_as_array가 원래 리스트를 돌려준 경우)은 영역 비교 없이 모든 점에 라벨
+            visible = np.ones(count, dtype=bool)
+        # Annotation 대신 같은 오프셋 변환을 공유하는 Text만 생성
+        offset = ax.transData + ScaledTranslation(5 / 72, 5 / 72, fig.dpi_scale_trans)
+        for i in np.flatnonzero(visible):
+            ax.text(xs[i], ys[i], labels[i], transform=offset, fontsize=10, fontweight='bold')
+    
+    ax.set_title(chart_data.get('title', ''), fontsize=16, fontweight='bold', pad=20)
+    
+    layout = chart_data.get('layout', {})
+    if 'xaxis' in layout:
+        ax.set_xlabel(layout['xaxis'].get('title', ''), fontsize=12)
+    if 'yaxis' in layout:
+        ax.set_ylabel(layout['yaxis'].get('title', ''), fontsize=12)
+    
+    ax.grid(True, alpha=0.3)
+    return _save_figure(fig, chart_data, options)
+
+
+def _create_horizontal_bar_chart(chart_data: Dict, options: RenderOptions) -> Tuple[str, bytes]:
+    """수평 막대 차트 생성"""
+    fig, ax = _reset_figure((10, 8))
+    
+    data = chart_data.get('data', {})
+    categories = data.get('categories', [])
+    values = _as_array(data.get('values', []))
+    
+    y_pos = np.arange(len(categories))
+    ax.barh(y_pos, values, alpha=0.8)
+    
+    ax.set_yticks(y_pos)
+    ax.set_yticklabels(categories)
+    ax.invert_yaxis()  # 위에서 아래로
+    
+    ax.set_title(chart_data.get('title', ''), fontsize=16, fontweight='bold', pad=20)
+    
+    layout = chart_data.get('layout', {})
+    if 'xaxis' in layout:
+        ax.set_xlabel(layout['xaxis'].get('title', ''), fontsize=12)
+    
+    ax.grid(True, alpha=0.3, axis='x')
+    return _save_figure(fig, chart_data, options)
+
+
+# 차트 타입 → 렌더링 함수 (없는 타입은 라인 차트)
+_CHART_RENDERERS = {
+    'line': _create_line_chart,
+    'bar': _create_bar_chart,
+    'pie': _create_pie_chart,
+    'bubble': _create_scatter_chart,
+    'scatter': _create_scatter_chart,
+    'horizontal_bar': _create_horizontal_bar_chart
+}
+
+
+def _render_chart(job: Tuple[Dict, RenderOptions]) -> Tuple[Optional[str], Optional[str], Optional[bytes], Optional[str]]:
+    """차트 하나를 렌더링해 (chart_id, 파일 경로, 파일 내용, 오류 메시지) 반환 (워커 프로세스에서 예외가 전파되지 않도록 오류는 문자열로)"""
+    chart, options = job
+    renderer = _CHART_RENDERERS.get(chart.get('type'), _create_line_chart)
+    try:
+        filepath, data = renderer(chart, options)
+        return chart.get('id'), filepath, data, None
+    except Exception as e:
+        return chart.get('id'), None, None, str(e)
+
+
 class ChartImageGenerator:
     """차트를 이미지 파일로 생성하는 클래스"""
     
-    def __init__(self, output_dir: str = "outputs/charts"):
+    def __init__(
+        self,
+        output_dir: str = "outputs/charts",
+        max_workers: Optional[int] = None,
+        dpi: int = 150,
+        png_compress_level: int = 1,
+        output_format: str = 'png'
+    ):
         """
         Args:
             output_dir: 차트 이미지를 저장할 디렉토리
+            max_workers: 동시에 렌더링할 프로세스 수 (기본: CPU 코어 수, 1이면 현재 프로세스에서 순차 실행)
+            dpi: 이미지 해상도
+            png_compress_level: PNG zlib 압축 수준 (0-9)
+            output_format: 'png' 또는 'svg'
         """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.dpi = dpi
+        self.png_compress_level = png_compress_level
+        if output_format not in ('png', 'svg'):
+            raise ValueError(f"지원하지 않는 출력 형식: {output_format}")
+        self.output_format = output_format
         
         # 생성된 차트 파일 경로 추적
         self.chart_files: Dict[str, str] = {}
+        
+        # 파일 쓰기 전용 스레드 (디스크 쓰기를 다음 차트 렌더링과 겹쳐 실행, 첫 쓰기 때 시작해 close()에서 종료)
+        self._io_queue: queue.Queue = queue.Queue()
+        self._io_thread: Optional[threading.Thread] = None
+        self._write_errors: Dict[str, str] = {}
     
     def generate_all_charts(self, charts_data: List[Dict]) -> Dict[str, str]:
         """
-        모든 차트를 이미지로 생성
+        모든 차트를 이미지로 생성 (차트마다 독립적인 CPU 작업이라 여러 프로세스에서 병렬 렌더링)
         
         Args:
             charts_data: Chart Generation Agent가 생성한 차트 데이터 리스트
@@ -44,213 +356,134 @@ class ChartImageGenerator:
         Returns:
             {chart_id: image_file_path} 딕셔너리
         """
-        for chart in charts_data:
-            chart_id = chart.get('id')
-            chart_type = chart.get('type')
-            
-            try:
-                if chart_type == 'line':
-                    filepath = self.create_line_chart(chart)
-                elif chart_type == 'bar':
-                    filepath = self.create_bar_chart(chart)
-                elif chart_type == 'pie':
-                    filepath = self.create_pie_chart(chart)
-                elif chart_type == 'bubble' or chart_type == 'scatter':
-                    filepath = self.create_scatter_chart(chart)
-                elif chart_type == 'horizontal_bar':
-                    filepath = self.create_horizontal_bar_chart(chart)
+        # 배치 전체가 같은 시각 + 순번으로 파일명을 만듦 (차트마다 시각을 새로 구하지 않음)
+        options = self._render_options(timestamp=datetime.now().strftime('%Y%m%d_%H%M%S'))
+        jobs = [(chart, replace(options, sequence=i)) for i, chart in enumerate(charts_data)]
+        
+        # 렌더링이 끝나는 대로 파일 쓰기를 IO 스레드에 넘기고 다음 차트로 진행
+        rendered: Dict[str, str] = {}
+        try:
+            for chart_id, filepath, data, error in self._render_jobs(jobs):
+                if error is None:
+                    self._write_async(chart_id, filepath, data)
+                    rendered[chart_id] = filepath
                 else:
-                    filepath = self.create_generic_chart(chart)
-                
+                    print(f"❌ Error creating chart {chart_id}: {error}")
+            
+            write_errors = self.flush()
+        finally:
+            # 배치가 끝나면 IO 스레드를 종료 (스레드가 generator를 붙잡아 실행마다 누적되지 않도록)
+            self.close()
+        for chart_id, filepath in rendered.items():
+            if chart_id in write_errors:
+                print(f"❌ Error saving chart {chart_id}: {write_errors[chart_id]}")
+            else:
                 self.chart_files[chart_id] = filepath
                 print(f"✅ Chart saved: {filepath}")
-                
-            except Exception as e:
-                print(f"❌ Error creating chart {chart_id}: {e}")
+        
+        # 순차 렌더링 시 현재 프로세스의 Figure가 마지막 차트를 붙잡고 있지 않도록 정리
+        # (Artist↔Axes 순환 참조는 세대별 GC 임계값에 닿기 전까지 남아 배치마다 RSS가 늘어남)
+        _release_figure()
         
         return self.chart_files
     
+    def flush(self) -> Dict[str, str]:
+        """대기 중인 파일 쓰기가 모두 끝날 때까지 대기 후 {chart_id: 오류 메시지} 반환"""
+        self._io_queue.join()
+        errors, self._write_errors = self._write_errors, {}
+        return errors
+    
+    def close(self):
+        """남은 쓰기를 마치고 IO 스레드 종료 (다음 쓰기 때 다시 시작)"""
+        if self._io_thread is None:
+            return
+        self._io_queue.put(_IO_STOP)
+        self._io_thread.join()
+        self._io_thread = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def _write_async(self, chart_id: str, filepath: str, data: bytes):
+        """파일 쓰기를 IO 스레드 큐에 추가"""
+        if self._io_thread is None:
+            self._io_thread = threading.Thread(target=self._io_worker, name='chart-image-writer', daemon=True)
+            self._io_thread.start()
+        self._io_queue.put((chart_id, filepath, data))
+    
+    def _io_worker(self):
+        """큐에서 (chart_id, 파일 경로, 내용)을 꺼내 디스크에 쓰는 스레드 루프"""
+        while True:
+            item = self._io_queue.get()
+            if item is _IO_STOP:
+                self._io_queue.task_done()
+                return
+            chart_id, filepath, data = item
+            try:
+                Path(filepath).write_bytes(data)
+            except OSError as e:
+                self._write_errors[chart_id] = str(e)
+            finally:
+                self._io_queue.task_done()
+    
+    def _save(self, chart_id: str, filepath: str, data: bytes) -> str:
+        """단일 차트 파일 저장 (쓰기가 끝난 뒤 경로 반환)"""
+        self._write_async(chart_id, filepath, data)
+        error = self.flush().get(chart_id)
+        self.close()
+        if error:
+            raise OSError(error)
+        return filepath
+    
+    def _render_options(self, timestamp: Optional[str] = None) -> RenderOptions:
+        """현재 설정으로 렌더링 옵션 생성 (timestamp: 배치 공통 파일명 시각)"""
+        return RenderOptions(
+            self.output_dir,
+            dpi=self.dpi,
+            png_compress_level=self.png_compress_level,
+            output_format=self.output_format,
+            timestamp=timestamp
+        )
+    
+    def _render_jobs(self, jobs: List[Tuple[Dict, RenderOptions]]) -> Iterator[Tuple[Optional[str], Optional[str], Optional[bytes], Optional[str]]]:
+        """렌더링 결과를 입력 순서대로 하나씩 반환 (2개 이상이면 프로세스 풀, 풀을 쓸 수 없으면 남은 작업을 순차 실행)"""
+        workers = min(self.max_workers, len(jobs))
+        done = 0
+        if workers > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    # map은 입력 순서대로 결과를 돌려줘 chart_files 순서가 유지됨
+                    for result in executor.map(_render_chart, jobs):
+                        done += 1
+                        yield result
+                return
+            except (OSError, BrokenProcessPool) as e:
+                print(f"⚠️ 프로세스 풀 사용 불가, 순차 렌더링으로 전환: {e}")
+        for job in jobs[done:]:
+            yield _render_chart(job)
+    
     def create_line_chart(self, chart_data: Dict) -> str:
         """라인 차트 생성"""
-        fig, ax = plt.subplots(figsize=(12, 6))
-        
-        data = chart_data.get('data', {})
-        x = data.get('x', [])
-        y = data.get('y', [])
-        
-        ax.plot(x, y, marker='o', linewidth=2, markersize=8)
-        
-        ax.set_title(chart_data.get('title', ''), fontsize=16, fontweight='bold', pad=20)
-        
-        layout = chart_data.get('layout', {})
-        if 'xaxis' in layout:
-            ax.set_xlabel(layout['xaxis'].get('title', ''), fontsize=12)
-        if 'yaxis' in layout:
-            ax.set_ylabel(layout['yaxis'].get('title', ''), fontsize=12)
-        
-        ax.grid(True, alpha=0.3)
-        plt.tight_layout()
-        
-        # 파일 저장
-        filename = f"{chart_data.get('id', 'chart')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-        filepath = self.output_dir / filename
-        plt.savefig(filepath, dpi=300, bbox_inches='tight', facecolor='white')
-        plt.close()
-        
-        return str(filepath)
+        return self._save(chart_data.get('id'), *_create_line_chart(chart_data, self._render_options()))
     
     def create_bar_chart(self, chart_data: Dict) -> str:
         """막대 차트 생성"""
-        fig, ax = plt.subplots(figsize=(12, 6))
-        
-        data = chart_data.get('data', {})
-        x = data.get('x', [])
-        
-        # 다중 시리즈 처리
-        series = data.get('series', [])
-        if 'y_ytd' in data and 'y_1y' in data:
-            # 주가 성과 차트 (YTD, 1Y)
-            x_pos = np.arange(len(x))
-            width = 0.35
-            
-            ax.bar(x_pos - width/2, data['y_ytd'], width, label='YTD Return (%)', alpha=0.8)
-            ax.bar(x_pos + width/2, data['y_1y'], width, label='1Y Return (%)', alpha=0.8)
-            
-            ax.set_xticks(x_pos)
-            ax.set_xticklabels(x, rotation=45, ha='right')
-            ax.legend()
-        else:
-            # 일반 막대 차트
-            y = data.get('y', [])
-            ax.bar(x, y, alpha=0.8)
-            ax.set_xticklabels(x, rotation=45, ha='right')
-        
-        ax.set_title(chart_data.get('title', ''), fontsize=16, fontweight='bold', pad=20)
-        
-        layout = chart_data.get('layout', {})
-        if 'xaxis' in layout:
-            ax.set_xlabel(layout['xaxis'].get('title', ''), fontsize=12)
-        if 'yaxis' in layout:
-            ax.set_ylabel(layout['yaxis'].get('title', ''), fontsize=12)
-        
-        ax.grid(True, alpha=0.3, axis='y')
-        plt.tight_layout()
-        
-        filename = f"{chart_data.get('id', 'chart')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-        filepath = self.output_dir / filename
-        plt.savefig(filepath, dpi=300, bbox_inches='tight', facecolor='white')
-        plt.close()
-        
-        return str(filepath)
+        return self._save(chart_data.get('id'), *_create_bar_chart(chart_data, self._render_options()))
     
     def create_pie_chart(self, chart_data: Dict) -> str:
         """파이 차트 생성"""
-        fig, ax = plt.subplots(figsize=(10, 8))
-        
-        data = chart_data.get('data', {})
-        labels = data.get('labels', [])
-        values = data.get('values', [])
-        
-        # 색상 팔레트
-        colors = sns.color_palette('husl', len(labels))
-        
-        wedges, texts, autotexts = ax.pie(
-            values,
-            labels=labels,
-            autopct='%1.1f%%',
-            startangle=90,
-            colors=colors,
-            textprops={'fontsize': 10}
-        )
-        
-        # 퍼센트 텍스트 굵게
-        for autotext in autotexts:
-            autotext.set_color('white')
-            autotext.set_fontweight('bold')
-        
-        ax.set_title(chart_data.get('title', ''), fontsize=16, fontweight='bold', pad=20)
-        
-        plt.tight_layout()
-        
-        filename = f"{chart_data.get('id', 'chart')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-        filepath = self.output_dir / filename
-        plt.savefig(filepath, dpi=300, bbox_inches='tight', facecolor='white')
-        plt.close()
-        
-        return str(filepath)
+        return self._save(chart_data.get('id'), *_create_pie_chart(chart_data, self._render_options()))
     
     def create_scatter_chart(self, chart_data: Dict) -> str:
         """산점도/버블 차트 생성"""
-        fig, ax = plt.subplots(figsize=(12, 8))
-        
-        data = chart_data.get('data', {})
-        x = data.get('x', [])
-        y = data.get('y', [])
-        size = data.get('size', [50] * len(x))  # 기본 크기
-        labels = data.get('labels', [])
-        
-        # 버블 차트
-        scatter = ax.scatter(x, y, s=size, alpha=0.6, edgecolors='black', linewidth=1.5)
-        
-        # 라벨 추가
-        for i, label in enumerate(labels):
-            ax.annotate(
-                label,
-                (x[i], y[i]),
-                xytext=(5, 5),
-                textcoords='offset points',
-                fontsize=10,
-                fontweight='bold'
-            )
-        
-        ax.set_title(chart_data.get('title', ''), fontsize=16, fontweight='bold', pad=20)
-        
-        layout = chart_data.get('layout', {})
-        if 'xaxis' in layout:
-            ax.set_xlabel(layout['xaxis'].get('title', ''), fontsize=12)
-        if 'yaxis' in layout:
-            ax.set_ylabel(layout['yaxis'].get('title', ''), fontsize=12)
-        
-        ax.grid(True, alpha=0.3)
-        plt.tight_layout()
-        
-        filename = f"{chart_data.get('id', 'chart')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-        filepath = self.output_dir / filename
-        plt.savefig(filepath, dpi=300, bbox_inches='tight', facecolor='white')
-        plt.close()
-        
-        return str(filepath)
+        return self._save(chart_data.get('id'), *_create_scatter_chart(chart_data, self._render_options()))
     
     def create_horizontal_bar_chart(self, chart_data: Dict) -> str:
         """수평 막대 차트 생성"""
-        fig, ax = plt.subplots(figsize=(10, 8))
-        
-        data = chart_data.get('data', {})
-        categories = data.get('categories', [])
-        values = data.get('values', [])
-        
-        y_pos = np.arange(len(categories))
-        ax.barh(y_pos, values, alpha=0.8)
-        
-        ax.set_yticks(y_pos)
-        ax.set_yticklabels(categories)
-        ax.invert_yaxis()  # 위에서 아래로
-        
-        ax.set_title(chart_data.get('title', ''), fontsize=16, fontweight='bold', pad=20)
-        
-        layout = chart_data.get('layout', {})
-        if 'xaxis' in layout:
-            ax.set_xlabel(layout['xaxis'].get('title', ''), fontsize=12)
-        
-        ax.grid(True, alpha=0.3, axis='x')
-        plt.tight_layout()
-        
-        filename = f"{chart_data.get('id', 'chart')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-        filepath = self.output_dir / filename
-        plt.savefig(filepath, dpi=300, bbox_inches='tight', facecolor='white')
-        plt.close()
-        
-        return str(filepath)
+        return self._save(chart_data.get('id'), *_create_horizontal_bar_chart(chart_data, self._render_options()))
     
     def create_generic_chart(self, chart_data: Dict) -> str:
         """기본 차트 (타입 불명확 시)"""
@@ -282,15 +515,18 @@ def insert_chart_in_markdown(
     # 상대 경로로 변환 (보고서와 차트가 같은 outputs 폴더에 있다고 가정)
     relative_path = Path(chart_image_path).name
     
-    chart_section = f"\n\n### 📊 {chart_title}\n\n"
-    chart_section += f"![{chart_title}](charts/{relative_path})\n\n"
+    parts = [
+        markdown_content,
+        f"\n\n### 📊 {chart_title}\n\n",
+        f"![{chart_title}](charts/{relative_path})\n\n"
+    ]
     
     if chart_insights:
-        chart_section += f"**주요 인사이트:** {chart_insights}\n\n"
+        parts.append(f"**주요 인사이트:** {chart_insights}\n\n")
     
-    chart_section += "---\n\n"
+    parts.append("---\n\n")
     
-    return markdown_content + chart_section
+    return "".join(parts)
 
 
 def insert_chart_in_html(
@@ -315,29 +551,33 @@ def insert_chart_in_html(
     """
     relative_path = Path(chart_image_path).name
     
-    chart_html = f"""
+    parts = [f"""
 <div class="chart-container" style="margin: 30px 0; padding: 20px; background: #f8f9fa; border-radius: 8px;">
     <h3 style="color: #2c3e50; margin-bottom: 15px;">📊 {chart_title}</h3>
     <img src="charts/{relative_path}" alt="{chart_title}" style="max-width: 100%; height: auto; border-radius: 4px; box-shadow: 0 2px 8px rgba(0,0,0,0.1);">
-"""
+"""]
     
     if chart_insights:
-        chart_html += f"""
+        parts.append(f"""
     <p style="margin-top: 15px; padding: 10px; background: #e8f4f8; border-left: 4px solid #3498db; font-style: italic;">
         <strong>주요 인사이트:</strong> {chart_insights}
     </p>
-"""
+""")
     
-    chart_html += """
+    parts.append("""
 </div>
-"""
+""")
+    chart_html = "".join(parts)
     
     if insert_after:
-        # 특정 위치에 삽입
-        return html_content.replace(insert_after, insert_after + chart_html)
-    else:
-        # </body> 태그 앞에 삽입
-        return html_content.replace('</body>', chart_html + '</body>')
+        # 특정 위치에 삽입 (첫 번째 위치에만)
+        return html_content.replace(insert_after, insert_after + chart_html, 1)
+    
+    # 마지막 </body> 태그 앞에 삽입 (뒤에서부터 찾고, 태그가 없으면 끝에 추가)
+    idx = html_content.rfind('</body>')
+    if idx == -1:
+        return html_content + chart_html
+    return html_content[:idx] + chart_html + html_content[idx:]
 
 
 def create_stock_charts_section(
@@ -354,30 +594,30 @@ def create_stock_charts_section(
     Returns:
         주가 차트 섹션 Markdown
     """
-    section = "\n\n## 📈 주가 분석 차트\n\n"
+    parts = ["\n\n## 📈 주가 분석 차트\n\n"]
     
     # 주가 성과 차트
     if 'stock_performance_chart' in chart_files:
         chart_path = chart_files['stock_performance_chart']
         relative_path = Path(chart_path).name
         
-        section += "### 주요 전기차 기업 주가 성과 비교\n\n"
-        section += f"![주가 성과](charts/{relative_path})\n\n"
-        section += "**분석:** 최근 1년간 전기차 관련 주식의 수익률을 비교한 차트입니다. "
-        section += "---\n\n"
+        parts.append("### 주요 전기차 기업 주가 성과 비교\n\n")
+        parts.append(f"![주가 성과](charts/{relative_path})\n\n")
+        parts.append("**분석:** 최근 1년간 전기차 관련 주식의 수익률을 비교한 차트입니다. ")
+        parts.append("---\n\n")
     
     # 밸류에이션 비교 차트
     if 'valuation_comparison_chart' in chart_files:
         chart_path = chart_files['valuation_comparison_chart']
         relative_path = Path(chart_path).name
         
-        section += "### 전기차 기업 밸류에이션 비교 (P/E vs P/S)\n\n"
-        section += f"![밸류에이션 비교](charts/{relative_path})\n\n"
-        section += "**분석:** 주가수익비율(P/E)과 주가매출비율(P/S)을 통해 각 기업의 밸류에이션을 비교합니다. "
-        section += "버블 크기는 시가총액을 나타냅니다.\n\n"
-        section += "---\n\n"
+        parts.append("### 전기차 기업 밸류에이션 비교 (P/E vs P/S)\n\n")
+        parts.append(f"![밸류에이션 비교](charts/{relative_path})\n\n")
+        parts.append("**분석:** 주가수익비율(P/E)과 주가매출비율(P/S)을 통해 각 기업의 밸류에이션을 비교합니다. ")
+        parts.append("버블 크기는 시가총액을 나타냅니다.\n\n")
+        parts.append("---\n\n")
     
-    return section
+    return "".join(parts)
 
 
 # 사용 예시
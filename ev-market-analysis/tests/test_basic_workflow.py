@@ -195,6 +195,175 @@ class TestSupervisorAgent:
             shutil.rmtree(supervisor.output_dir)
 
 
+class TestReportHtmlFormatting:
+    """ReportGenerationAgent HTML 변환 테스트"""
+    
+    def setup_method(self):
+        """각 테스트 전 실행"""
+        from agents.report_generation_agent import ReportGenerationAgent
+        self.agent = ReportGenerationAgent()
+    
+    def test_bold_markup_all_pairs(self):
+        """문단 내 모든 **text** 쌍 변환 테스트"""
+        html = self.agent._format_text_to_html("**A** 그리고 **B**, **C**")
+        
+        assert html == "<p><strong>A</strong> 그리고 <strong>B</strong>, <strong>C</strong></p>"
+    
+    def test_unbalanced_bold_markup(self):
+        """짝이 없는 ** 는 그대로 유지되는지 테스트"""
+        html = self.agent._format_text_to_html("**A** 그리고 **B")
+        
+        assert html == "<p><strong>A</strong> 그리고 **B</p>"
+    
+    def test_escapes_section_text(self):
+        """본문과 표 셀의 HTML 특수문자 이스케이프 테스트"""
+        html = self.agent._format_text_to_html("<b>A & B</b>\n\n| <i>h</i> |\n|---|\n| x<y |")
+        
+        assert "<p>&lt;b&gt;A &amp; B&lt;/b&gt;</p>" in html
+        assert "<th>&lt;i&gt;h&lt;/i&gt;</th>" in html
+        assert "<td>x&lt;y</td>" in html
+
+
+@pytest.mark.asyncio
+class TestFileCache:
+    """FileCache 테스트"""
+
+    def teardown_method(self):
+        """각 테스트 후 정리"""
+        import shutil
+        if Path("test_cache").exists():
+            shutil.rmtree("test_cache")
+
+    async def test_set_get_and_expire(self):
+        """저장/디스크 재조회/TTL 만료 테스트"""
+        from agents.file_cache import FileCache
+        cache = FileCache("test_cache", ttl=60)
+        key = FileCache.key('analysis', 'TSLA', '2025-01-01')
+
+        assert await cache.get(key) is None
+
+        await cache.set(key, {'ticker': 'TSLA'})
+        await cache.set('expired', 1, ttl=-1)
+
+        # 새 인스턴스는 디스크에서 읽어옴
+        reloaded = FileCache("test_cache", ttl=60)
+        assert await reloaded.get(key) == {'ticker': 'TSLA'}
+        assert await reloaded.get('expired') is None
+
+
+class TestStockVolumeAnalysis:
+    """StockAnalysisAgent 거래량 분석 테스트"""
+
+    def test_missing_volume_skipped(self):
+        """평균 구간에 거래량 NaN이 있어도 pandas mean처럼 건너뛰는지 테스트"""
+        import numpy as np
+        import pandas as pd
+        from agents.stock_analysis_agent import StockAnalysisAgent
+        volumes = pd.Series(np.arange(1, 101, dtype=float) * 1000)
+        volumes[90] = np.nan
+
+        result = StockAnalysisAgent()._analyze_volume(pd.DataFrame({'Volume': volumes}))
+
+        assert result['current_volume'] == 100000
+        assert result['avg_volume_3m'] == int(volumes.iloc[-63:].mean())
+        assert result['avg_volume_1m'] == int(volumes.iloc[-21:].mean())
+
+
+@pytest.mark.asyncio
+class TestTavilyLimiter:
+    """TavilyLimiter 테스트"""
+
+    async def test_limits_concurrency_and_rate(self):
+        """동시 요청 수와 기간당 요청 수 제한 테스트"""
+        import time
+        from agents.rate_limiter import TavilyLimiter
+        limiter = TavilyLimiter(max_concurrent=2, max_calls=3, period=0.2)
+        active = 0
+        peak = 0
+        started = []
+
+        async def call():
+            nonlocal active, peak
+            async with limiter:
+                started.append(time.monotonic())
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        await asyncio.gather(*[call() for _ in range(6)])
+
+        assert peak <= 2
+        # 0.2초 윈도우 안에서는 최대 3회 → 4번째 호출은 첫 호출 후 0.2초 이상 지나서 시작
+        started.sort()
+        assert started[3] - started[0] >= 0.19
+
+        # 제한 응답 시 동시 요청 한도 절반, 성공 시 0.5씩 증가 (최대 한도까지)
+        await limiter.record_throttle()
+        assert limiter.concurrency == 1
+        await limiter.record_success()
+        await limiter.record_success()
+        await limiter.record_success()
+        assert limiter.concurrency == 2
+
+    async def test_window_counts_actual_starts(self):
+        """슬롯을 오래 기다린 호출도 실제 시작 시각 기준으로 윈도우 한도를 지키는지 테스트"""
+        import time
+        from agents.rate_limiter import TavilyLimiter
+        limiter = TavilyLimiter(max_concurrent=3, max_calls=3, period=0.2)
+        started = []
+
+        async def call(duration):
+            async with limiter:
+                started.append(time.monotonic())
+                await asyncio.sleep(duration)
+
+        await asyncio.gather(*[call((0.01, 0.05, 0.3)[i % 3]) for i in range(12)])
+
+        started.sort()
+        # 어느 0.2초 구간에도 시작이 3회를 넘지 않음 (이벤트 루프 지연 여유 10ms)
+        for i, start in enumerate(started):
+            assert sum(start <= t < start + 0.19 for t in started[i:]) <= 3
+
+
+class TestChartImageGenerator:
+    """ChartImageGenerator 테스트"""
+
+    def teardown_method(self):
+        """각 테스트 후 정리"""
+        import shutil
+        if Path("test_chart_images").exists():
+            shutil.rmtree("test_chart_images")
+
+    def test_generate_all_charts(self):
+        """차트 타입별 이미지 생성 및 실패 차트 건너뛰기 테스트"""
+        from chart_to_image_integration import ChartImageGenerator
+        generator = ChartImageGenerator(output_dir="test_chart_images", max_workers=1)
+        charts = [
+            {'id': 'line', 'type': 'line', 'title': 'Line', 'data': {'x': [1, 2, 3], 'y': [3, 1, 2]}},
+            {'id': 'pie', 'type': 'pie', 'title': 'Pie', 'data': {'labels': ['A', 'B'], 'values': [60, 40]}},
+            {'id': 'scatter', 'type': 'scatter', 'title': 'Scatter',
+             'data': {'x': ['a', 'b'], 'y': [1, 2], 'labels': ['p', 'q']}},
+            {'id': 'broken', 'type': 'line', 'data': {'x': [1, 2, 3], 'y': [1, 2]}}
+        ]
+
+        chart_files = generator.generate_all_charts(charts)
+
+        assert list(chart_files) == ['line', 'pie', 'scatter']
+        assert all(Path(path).exists() for path in chart_files.values())
+
+    def test_writer_thread_stops_after_batch(self):
+        """배치가 끝나면 파일 쓰기 스레드가 남지 않는지 테스트"""
+        import threading
+        from chart_to_image_integration import ChartImageGenerator
+        charts = [{'id': 'line', 'type': 'line', 'title': 'Line', 'data': {'x': [1, 2], 'y': [2, 1]}}]
+
+        for _ in range(2):
+            ChartImageGenerator(output_dir="test_chart_images", max_workers=1).generate_all_charts(charts)
+
+        assert not [t for t in threading.enumerate() if t.name == 'chart-image-writer']
+
+
 class TestWorkflowIntegration:
     """워크플로우 통합 테스트"""
     